@@ -0,0 +1,235 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: admission.py
+Responsibility:
+    Admission control in front of the database. Caps the
+    number of in-flight requests per blueprint and overall,
+    queues a bounded number of waiters by priority, and
+    sheds excess load with a fast 503 response.
+Learning Outcomes:
+    LO2 – Backend web-service configuration
+    LO4 – Robust API design under load
+-------------------------------------------------
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from flask import g, jsonify, request
+
+from db import POOL_SIZE
+
+# Request priorities; lower values are admitted first.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Per-blueprint limits: (max in-flight requests, max queued requests).
+BLUEPRINT_LIMITS = {
+    "items": (8, 32),
+    "members": (4, 16),
+    "reservations": (4, 16),
+    "loans": (4, 32),
+    "branches": (4, 16),
+}
+
+# Every admitted request also takes a slot at the database gate,
+# sized to the connection pool so requests never wait on (or
+# overflow) the pool itself. This is where priorities matter most:
+# checkouts and returns overtake catalogue browsing.
+DATABASE_LIMIT = (POOL_SIZE if POOL_SIZE > 0 else 8, 64)
+
+# Time-critical routes are admitted ahead of browsing; endpoints
+# not listed here run at PRIORITY_NORMAL.
+ROUTE_PRIORITIES = {
+    "loans.borrow_item": PRIORITY_HIGH,
+    "loans.return_item": PRIORITY_HIGH,
+    "items.get_items": PRIORITY_LOW,
+    "items.get_item": PRIORITY_LOW,
+    "items.get_item_copies": PRIORITY_LOW,
+    "items.get_popular_items": PRIORITY_LOW,
+}
+
+# Blueprints that never touch the database.
+EXEMPT_BLUEPRINTS = {"frontend"}
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") != "0"
+
+# Longest time a request may wait in a queue before being shed.
+QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+
+# Seconds clients are asked to wait before retrying a shed request.
+RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "shed")
+
+    def __init__(self, priority, seq):
+        self.priority = priority
+        self.seq = seq
+        self.shed = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class Gate:
+    """
+    A concurrency limit with a bounded, priority-ordered wait queue.
+
+    Waiters are admitted in (priority, arrival) order. When the
+    queue is full, a new request either displaces the lowest
+    priority waiter (if it outranks it) or is shed immediately.
+    """
+
+    def __init__(self, name, limit, max_queue):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = []
+        self._seq = itertools.count()
+
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    def acquire(self, priority, timeout):
+        """
+        Waits up to timeout seconds for a slot.
+
+        Returns:
+            True if admitted, False if the request was shed.
+        """
+        with self._cond:
+            if self._in_flight < self.limit and not self._waiting:
+                self._in_flight += 1
+                self.admitted += 1
+                return True
+
+            if len(self._waiting) >= self.max_queue:
+                worst = max(self._waiting)
+                if worst.priority <= priority:
+                    self.shed += 1
+                    return False
+
+                # Shed the lowest-priority waiter to make room.
+                self._waiting.remove(worst)
+                heapq.heapify(self._waiting)
+                worst.shed = True
+                self.shed += 1
+                self._cond.notify_all()
+
+            waiter = _Waiter(priority, next(self._seq))
+            heapq.heappush(self._waiting, waiter)
+            deadline = time.monotonic() + timeout
+
+            while True:
+                if waiter.shed:
+                    return False
+
+                if self._waiting[0] is waiter and self._in_flight < self.limit:
+                    heapq.heappop(self._waiting)
+                    self._in_flight += 1
+                    self.admitted += 1
+                    # Let the next waiter check whether a slot is still free.
+                    self._cond.notify_all()
+                    return True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    heapq.heapify(self._waiting)
+                    self.timed_out += 1
+                    self.shed += 1
+                    self._cond.notify_all()
+                    return False
+
+                self._cond.wait(remaining)
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._waiting),
+                "admitted": self.admitted,
+                "shed": self.shed,
+                "timed_out": self.timed_out,
+            }
+
+
+class AdmissionController:
+    """
+    Flask extension that gates each request through its blueprint
+    gate and the shared database gate.
+    """
+
+    def __init__(self, app=None):
+        self.gates = {
+            name: Gate(name, limit, max_queue)
+            for name, (limit, max_queue) in BLUEPRINT_LIMITS.items()
+        }
+        self.database = Gate("database", *DATABASE_LIMIT)
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["admission"] = self
+        if ADMISSION_ENABLED:
+            app.before_request(self._admit)
+            app.teardown_request(self._release)
+
+    def _admit(self):
+        # CORS preflight requests and non-database routes pass straight through.
+        blueprint = request.blueprint
+        if (request.method == "OPTIONS" or blueprint is None
+                or blueprint in EXEMPT_BLUEPRINTS):
+            return None
+
+        priority = ROUTE_PRIORITIES.get(request.endpoint, PRIORITY_NORMAL)
+        deadline = time.monotonic() + QUEUE_TIMEOUT
+        acquired = []
+
+        for gate in (self.gates.get(blueprint), self.database):
+            if gate is None:
+                continue
+            if not gate.acquire(priority, max(0.0, deadline - time.monotonic())):
+                for held in reversed(acquired):
+                    held.release()
+                return self._busy_response()
+            acquired.append(gate)
+
+        g.admission_gates = acquired
+        return None
+
+    def _release(self, _exc):
+        for gate in reversed(g.pop("admission_gates", [])):
+            gate.release()
+
+    def _busy_response(self):
+        response = jsonify({"error": "Server busy, please retry shortly"})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(RETRY_AFTER)
+        return response
+
+    def stats(self):
+        """Returns queue depth, in-flight and shed counts for every gate."""
+        stats = {name: gate.stats() for name, gate in self.gates.items()}
+        stats["database"] = self.database.stats()
+        stats["enabled"] = ADMISSION_ENABLED
+        return stats
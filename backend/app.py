@@ -13,9 +13,11 @@ Learning Outcomes:
 -------------------------------------------------
 """
 
+import os
 from flask import Flask, jsonify
 from flask_cors import CORS
-from db import get_db_connection
+from db import get_db_connection, release_connections
+from admission import AdmissionController
 
 # Import route blueprints implemented as part of
 # the backend service layer.
@@ -23,6 +25,8 @@ from routes.items import items_bp
 from routes.loans import loans_bp
 from routes.members import members_bp
 from routes.reservations import reservations_bp
+from routes.branches import branches_bp
+from routes.frontend import frontend_bp
 
 # -------------------------------------------------
 # Application setup
@@ -35,6 +39,11 @@ from routes.reservations import reservations_bp
 app = Flask(__name__)
 CORS(app)
 
+# Lets a front-end proxy (e.g. nginx / Apache) send static files
+# itself when USE_X_SENDFILE=1; otherwise the WSGI server's file
+# wrapper streams them.
+app.config["USE_X_SENDFILE"] = os.getenv("USE_X_SENDFILE") == "1"
+
 # -------------------------------------------------
 # Register API blueprints
 # -------------------------------------------------
@@ -44,6 +53,21 @@ app.register_blueprint(items_bp)
 app.register_blueprint(loans_bp)
 app.register_blueprint(members_bp)
 app.register_blueprint(reservations_bp)
+app.register_blueprint(branches_bp)
+app.register_blueprint(frontend_bp)
+
+# -------------------------------------------------
+# Admission control
+# -------------------------------------------------
+# Caps concurrent database work per blueprint and overall,
+# admitting borrow/return ahead of catalogue browsing and
+# returning a fast 503 with Retry-After when queues overflow.
+admission = AdmissionController(app)
+
+# Returns connections left open by a failing route to the pool.
+# Teardown hooks run in reverse order, so registering this after
+# admission control frees the connection before the gate slot.
+app.teardown_request(release_connections)
 
 
 # -------------------------------------------------
@@ -68,6 +92,16 @@ def test_db():
     return "Database connection successful"
 
 
+# -------------------------------------------------
+# Admission control monitoring endpoint
+# -------------------------------------------------
+@app.route("/admission/stats")
+def admission_stats():
+    # Reports in-flight requests, queue depth and shed
+    # counts for each gate, for monitoring dashboards.
+    return jsonify(admission.stats()), 200
+
+
 # -------------------------------------------------
 # Global JSON error handlers
 # -------------------------------------------------
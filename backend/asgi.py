@@ -0,0 +1,240 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: asgi.py
+Responsibility:
+    Asyncio serving mode for the read endpoints of the
+    items, members and reservations blueprints. Database
+    work runs on a bounded thread pool so one worker can
+    serve many concurrent browsers, and independent
+    queries for a response run concurrently.
+Usage (from the backend folder, requires uvicorn):
+    python asgi.py
+    uvicorn asgi:application --port 5001
+Learning Outcomes:
+    LO2 – Backend web-service configuration
+-------------------------------------------------
+"""
+
+import asyncio
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from db import get_db_connection, POOL_SIZE
+from statements import fetch_one, fetch_all
+import popularity
+from app import app as flask_app
+from routes.items import (
+    LIST_ITEMS,
+    GET_ITEM,
+    ITEM_COPIES,
+    BRANCH_EXISTS,
+    parse_popular_args,
+)
+from routes.members import (
+    GET_MEMBER,
+    MEMBER_ACTIVE_LOANS,
+    MEMBER_RESERVATIONS,
+    annotate_overdue,
+)
+from routes.reservations import ITEM_RESERVATIONS
+
+# Threads available for blocking database calls. Defaults to the
+# connection pool size so queries never wait on the pool itself.
+DB_WORKERS = int(os.getenv("ASYNC_DB_WORKERS", str(POOL_SIZE if POOL_SIZE > 0 else 8)))
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------
+# Blocking database helpers (run on the executor)
+# -------------------------------------------------
+# Each call borrows its own connection so that calls can run
+# in parallel on different threads.
+def _query_all(stmt, params=()):
+    conn = get_db_connection()
+    try:
+        return fetch_all(conn, stmt, params)
+    finally:
+        conn.close()
+
+
+def _query_one(stmt, params=()):
+    conn = get_db_connection()
+    try:
+        return fetch_one(conn, stmt, params)
+    finally:
+        conn.close()
+
+
+def _query_popular(window, branch_id, limit):
+    # Returns None when the branch does not exist.
+    conn = get_db_connection()
+    try:
+        if branch_id is not None and not fetch_one(conn, BRANCH_EXISTS, (branch_id,)):
+            return None
+        return popularity.top_items(conn, window, branch_id, limit)
+    finally:
+        conn.close()
+
+
+async def _run_db(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, func, *args)
+
+
+# -------------------------------------------------
+# Read endpoints
+# -------------------------------------------------
+# Responses match the Flask routes of the same paths.
+async def get_items(_query):
+    return await _run_db(_query_all, LIST_ITEMS), 200
+
+
+async def get_popular_items(query):
+    parsed, error = parse_popular_args(query)
+    if error:
+        return {"error": error}, 400
+
+    window, branch_id, limit = parsed
+    items = await _run_db(_query_popular, window, branch_id, limit)
+    if items is None:
+        return {"error": "Branch not found"}, 404
+    return {"window": window, "branch_id": branch_id, "items": items}, 200
+
+
+async def get_item(_query, item_id):
+    item = await _run_db(_query_one, GET_ITEM, (item_id,))
+    if not item:
+        return {"error": "Item not found"}, 404
+    return item, 200
+
+
+async def get_item_copies(_query, item_id):
+    copies = await _run_db(_query_all, ITEM_COPIES, (item_id,))
+    if not copies:
+        return {"error": "No copies found for this item"}, 404
+    return {"item_id": item_id, "copies": copies}, 200
+
+
+async def get_member_summary(_query, member_id):
+    # The member row and the active loans do not depend on each
+    # other, so both queries run at the same time.
+    member, active_loans = await asyncio.gather(
+        _run_db(_query_one, GET_MEMBER, (member_id,)),
+        _run_db(_query_all, MEMBER_ACTIVE_LOANS, (member_id,)),
+    )
+    if not member:
+        return {"error": "Member not found"}, 404
+
+    member["active_loans"] = annotate_overdue(active_loans)
+    return member, 200
+
+
+async def get_member_reservations(_query, member_id):
+    reservations = await _run_db(_query_all, MEMBER_RESERVATIONS, (member_id,))
+    return {"reservations": reservations}, 200
+
+
+async def get_item_reservations(_query, item_id):
+    reservations = await _run_db(_query_all, ITEM_RESERVATIONS, (item_id,))
+    return {"item_id": item_id, "reservations": reservations}, 200
+
+
+# Route table: path pattern -> handler. Integer path segments are
+# passed to the handler as ints, like Flask's <int:...> converter.
+ROUTES = [
+    (re.compile(r"^/items$"), get_items),
+    (re.compile(r"^/items/popular$"), get_popular_items),
+    (re.compile(r"^/items/(\d+)$"), get_item),
+    (re.compile(r"^/items/(\d+)/copies$"), get_item_copies),
+    (re.compile(r"^/items/(\d+)/reservations$"), get_item_reservations),
+    (re.compile(r"^/members/(\d+)$"), get_member_summary),
+    (re.compile(r"^/members/(\d+)/reservations$"), get_member_reservations),
+]
+
+
+async def _dispatch(scope):
+    path = scope["path"]
+    for pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match:
+            break
+    else:
+        return {"error": "Route not found"}, 404
+
+    # Only the read endpoints are served in async mode.
+    if scope["method"] not in ("GET", "HEAD"):
+        return {"error": "Method not allowed"}, 405
+
+    query = MultiDict(parse_qsl(scope["query_string"].decode("latin-1")))
+    try:
+        return await handler(query, *(int(arg) for arg in match.groups()))
+    except Exception:
+        # Keeps error responses clean and avoids leaking
+        # internal server details to the client, while the
+        # traceback is still logged for the operator.
+        logger.exception("Unhandled error serving %s %s", scope["method"], path)
+        return {"error": "Internal server error"}, 500
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            # Waiting for in-flight queries blocks, so it runs off
+            # the event loop.
+            await asyncio.to_thread(_executor.shutdown, wait=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    payload, status = await _dispatch(scope)
+
+    # Serialise with the Flask app's JSON provider so dates and
+    # decimals are formatted as in the sync mode, using the compact
+    # separators jsonify uses outside debug mode.
+    body = flask_app.json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({
+        "type": "http.response.body",
+        "body": b"" if scope["method"] == "HEAD" else body,
+    })
+
+
+# -------------------------------------------------
+# Application entry point
+# -------------------------------------------------
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The async mode needs uvicorn: pip install uvicorn")
+
+    uvicorn.run(application, host="127.0.0.1", port=int(os.getenv("ASYNC_PORT", "5001")))
@@ -0,0 +1,193 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: availability.py
+Responsibility:
+    Optional in-memory index of available copies per branch,
+    kept as a bitmap over the branch's copies in (ItemID,
+    CopyID) order and updated by the loan and return routes.
+Learning Outcomes:
+    LO3 – Derived data and query performance
+-------------------------------------------------
+"""
+
+import os
+import threading
+from bisect import bisect_right
+
+from db import get_db_connection
+from statements import statement, fetch_all
+
+# The bitmap is per process. Only enable it when a single backend
+# process handles loans and returns; otherwise other processes'
+# updates are not seen until the branch is reloaded.
+#
+# Changes made outside the backend (demo_reset.sql, tools such as
+# generate_dataset) are not seen either; after running them, call
+# POST /branches/availability/reload or restart the backend.
+AVAILABILITY_INDEX_ENABLED = os.getenv("BRANCH_AVAILABILITY_INDEX", "0") == "1"
+
+BRANCH_COPY_STATUS = statement(
+    "availability.branch_copies",
+    """
+    SELECT ItemID, CopyID, Status
+    FROM ItemCopy
+    WHERE BranchID = %s
+    ORDER BY ItemID, CopyID
+    """
+)
+
+
+class _BranchBitmap:
+    """
+    Bit i is set when the i-th copy of the branch, in (ItemID,
+    CopyID) order, is available.
+    """
+
+    def __init__(self, rows):
+        self.keys = [(row["ItemID"], row["CopyID"]) for row in rows]
+        self.positions = {copy_id: pos for pos, (_, copy_id) in enumerate(self.keys)}
+        self.bits = 0
+        for pos, row in enumerate(rows):
+            if row["Status"] == "Available":
+                self.bits |= 1 << pos
+
+
+class _PendingLoad:
+    """Updates that arrive while a branch's bitmap is being loaded."""
+
+    def __init__(self):
+        self.updates = []
+        self.valid = True
+
+
+def _apply(bitmap, copy_id, available):
+    # Returns False when the copy is unknown to the bitmap.
+    pos = bitmap.positions.get(copy_id)
+    if pos is None:
+        return False
+    if available:
+        bitmap.bits |= 1 << pos
+    else:
+        bitmap.bits &= ~(1 << pos)
+    return True
+
+
+class BranchAvailabilityIndex:
+    """
+    Lazily loaded per-branch bitmaps of available copies.
+
+    Branches are loaded from the database on first use. Updates
+    for copies the bitmap does not know about (e.g. copies added
+    directly in SQL) drop the branch so it is reloaded next time.
+
+    A load reads the branch outside the lock, so a borrow or return
+    may commit while it runs. Such updates are recorded against the
+    load and replayed onto the new bitmap before it is published;
+    the load runs on its own connection so its snapshot is taken
+    after recording has started.
+    """
+
+    def __init__(self):
+        self._branches = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def _bitmap(self, branch_id):
+        with self._lock:
+            bitmap = self._branches.get(branch_id)
+            if bitmap is not None:
+                return bitmap
+            pending = _PendingLoad()
+            self._loading.setdefault(branch_id, []).append(pending)
+
+        try:
+            conn = get_db_connection()
+            try:
+                rows = fetch_all(conn, BRANCH_COPY_STATUS, (branch_id,))
+            finally:
+                conn.close()
+            bitmap = _BranchBitmap(rows)
+        finally:
+            with self._lock:
+                self._loading[branch_id].remove(pending)
+                if not self._loading[branch_id]:
+                    del self._loading[branch_id]
+
+        with self._lock:
+            for copy_id, available in pending.updates:
+                if not _apply(bitmap, copy_id, available):
+                    pending.valid = False
+            # A load that was invalidated, or saw an unknown copy, still
+            # answers this request but is not kept for later ones.
+            if pending.valid:
+                bitmap = self._branches.setdefault(branch_id, bitmap)
+        return bitmap
+
+    def set_available(self, branch_id, copy_id, available):
+        with self._lock:
+            for pending in self._loading.get(branch_id, ()):
+                pending.updates.append((copy_id, available))
+
+            bitmap = self._branches.get(branch_id)
+            if bitmap is not None and not _apply(bitmap, copy_id, available):
+                del self._branches[branch_id]
+
+    def invalidate(self, branch_id=None):
+        """Drops loaded bitmaps (all branches by default) so they are reloaded."""
+        with self._lock:
+            if branch_id is None:
+                self._branches.clear()
+                loads = [p for ps in self._loading.values() for p in ps]
+            else:
+                self._branches.pop(branch_id, None)
+                loads = self._loading.get(branch_id, [])
+            for pending in loads:
+                pending.valid = False
+
+    def available_count(self, branch_id):
+        bitmap = self._bitmap(branch_id)
+        with self._lock:
+            return bin(bitmap.bits).count("1")
+
+    def available_page(self, branch_id, after, limit):
+        """
+        Returns up to limit (ItemID, CopyID) keys of available copies
+        that sort after the keyset cursor `after`.
+        """
+        bitmap = self._bitmap(branch_id)
+        start = bisect_right(bitmap.keys, after)
+
+        with self._lock:
+            remaining = bitmap.bits >> start
+
+        page = []
+        while remaining and len(page) < limit:
+            lowest = remaining & -remaining
+            page.append(bitmap.keys[start + lowest.bit_length() - 1])
+            remaining ^= lowest
+        return page
+
+
+branch_availability = BranchAvailabilityIndex()
+
+
+# The routes call these just before committing, while they still
+# hold the copy's row lock. Two updates to the same copy therefore
+# reach the index in the order their transactions commit.
+def mark_on_loan(branch_id, copy_id):
+    """Records a borrow in the availability index, if enabled."""
+    if AVAILABILITY_INDEX_ENABLED:
+        branch_availability.set_available(branch_id, copy_id, False)
+
+
+def mark_available(branch_id, copy_id):
+    """Records a return in the availability index, if enabled."""
+    if AVAILABILITY_INDEX_ENABLED:
+        branch_availability.set_available(branch_id, copy_id, True)
+
+
+def discard_branch(branch_id):
+    """Drops a branch whose update did not commit, so it is reloaded."""
+    if AVAILABILITY_INDEX_ENABLED:
+        branch_availability.invalidate(branch_id)
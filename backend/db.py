@@ -1,16 +1,3 @@
-import mysql.connector
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-def get_db_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME")
-    )
 """
 -------------------------------------------------
 Author: Abraham Sharkey
@@ -23,31 +10,130 @@ Learning Outcomes:
 -------------------------------------------------
 """
 
+import logging
 import mysql.connector
 import os
+import threading
 from dotenv import load_dotenv
+from flask import g, has_app_context
+from mysql.connector import pooling
+from mysql.connector.errors import Error, PoolError
 
 # Load environment variables from the .env file.
 # This keeps database credentials out of source code
 # and follows best security practices.
 load_dotenv()
 
+# Number of connections kept open in the shared pool.
+# Setting DB_POOL_SIZE=0 restores one fresh connection per request.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def connection_config():
+    """Returns the MySQL connection settings read from the environment."""
+    return {
+        "host": os.getenv("DB_HOST"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "database": os.getenv("DB_NAME"),
+    }
+
+
+class _PooledConnection(pooling.PooledMySQLConnection):
+    """
+    Pooled connection that rolls back any open transaction
+    before it is handed back to the pool.
+
+    Design Decision:
+        The pool does not reset sessions (so server-side prepared
+        statements survive between requests), which means a route
+        that returns early must not leave a snapshot or row locks
+        behind for the next borrower of the connection.
+    """
+
+    def close(self):
+        # Already returned to the pool (e.g. closed by the route
+        # and again by release_connections).
+        if self._cnx is None:
+            return
+        try:
+            if self._cnx.in_transaction:
+                self._cnx.rollback()
+        finally:
+            super().close()
+
+
+class _ConnectionPool(pooling.MySQLConnectionPool):
+    def get_connection(self):
+        conn = super().get_connection()
+        return _PooledConnection(self, conn._cnx)
+
+
+def _get_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = _ConnectionPool(
+                pool_name="library_pool",
+                pool_size=POOL_SIZE,
+                pool_reset_session=False,
+                **connection_config()
+            )
+    return _pool
+
 
 def get_db_connection():
     """
-    Creates and returns a new MySQL database connection.
+    Returns a MySQL database connection for the current request.
 
     Design Decision:
-        A new connection is created per request to ensure
-        thread safety and predictable connection lifecycle
-        management within Flask.
+        Connections are borrowed from a shared pool so that the
+        per-connection prepared statement cache (see statements.py)
+        is reused across requests. Calling close() returns the
+        connection to the pool. If the pool is exhausted a fresh,
+        unpooled connection is opened instead of failing the request.
+
+        Inside a request the connection is also recorded on flask.g,
+        so release_connections() closes it even when the route raises
+        before reaching its own close() call.
 
     Returns:
-        mysql.connector.connection.MySQLConnection
+        mysql.connector connection (pooled or direct)
+    """
+    if POOL_SIZE <= 0:
+        conn = mysql.connector.connect(**connection_config())
+    else:
+        try:
+            conn = _get_pool().get_connection()
+        except PoolError:
+            logger.warning(
+                "Connection pool exhausted (DB_POOL_SIZE=%d); "
+                "opening an unpooled connection", POOL_SIZE
+            )
+            conn = mysql.connector.connect(**connection_config())
+
+    if has_app_context():
+        g.setdefault("db_connections", []).append(conn)
+    return conn
+
+
+def release_connections(_exc=None):
+    """
+    Closes every connection the current request opened.
+
+    Registered as a request teardown hook in app.py. Connections
+    the route already closed are skipped, so this only matters
+    when a route raised (e.g. a deadlock or lock wait timeout)
+    and would otherwise lose its pool slot for good.
     """
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME")
-    )
+    for conn in g.pop("db_connections", []):
+        try:
+            conn.close()
+        except Error:
+            logger.exception("Failed to close database connection")
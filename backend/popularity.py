@@ -0,0 +1,245 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: popularity.py
+Responsibility:
+    Maintains the precomputed loan counters behind the
+    "most borrowed" rankings and serves top-N queries
+    from them instead of aggregating the Loan table.
+Learning Outcomes:
+    LO3 – Derived data and query performance
+-------------------------------------------------
+"""
+
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+from statements import statement, fetch_all, execute
+
+# Supported ranking windows mapped to their length in days.
+# "all" is served from the all-time totals tables.
+WINDOWS = {"7d": 7, "30d": 30, "all": None}
+
+# Daily buckets older than the longest window are never read.
+BUCKET_RETENTION_DAYS = max(days for days in WINDOWS.values() if days)
+
+# Rankings are cached in-process for a short time so repeated
+# home page loads do not hit the database at all.
+CACHE_SECONDS = int(os.getenv("POPULAR_CACHE_SECONDS", "60"))
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+# -------------------------------------------------
+# Registered statements
+# -------------------------------------------------
+RECORD_DAILY_LOAN = statement(
+    "popularity.record_daily",
+    """
+    INSERT INTO ItemLoanDaily (BucketDate, BranchID, ItemID, LoanCount)
+    VALUES (%s, %s, %s, 1)
+    ON DUPLICATE KEY UPDATE LoanCount = LoanCount + 1
+    """
+)
+
+RECORD_TOTAL_LOAN = statement(
+    "popularity.record_total",
+    """
+    INSERT INTO ItemLoanTotal (BranchID, ItemID, LoanCount)
+    VALUES (%s, %s, 1)
+    ON DUPLICATE KEY UPDATE LoanCount = LoanCount + 1
+    """
+)
+
+RECORD_OVERALL_LOAN = statement(
+    "popularity.record_overall",
+    """
+    INSERT INTO ItemLoanOverall (ItemID, LoanCount)
+    VALUES (%s, 1)
+    ON DUPLICATE KEY UPDATE LoanCount = LoanCount + 1
+    """
+)
+
+_TOP_WINDOW = """
+    SELECT
+        d.ItemID,
+        i.Title,
+        i.Author,
+        i.ItemType,
+        CAST(SUM(d.LoanCount) AS UNSIGNED) AS LoanCount
+    FROM ItemLoanDaily d
+    JOIN Item i ON d.ItemID = i.ItemID
+    WHERE d.BucketDate >= %s
+    {branch_filter}
+    GROUP BY d.ItemID, i.Title, i.Author, i.ItemType
+    ORDER BY LoanCount DESC, d.ItemID
+    LIMIT %s
+"""
+
+TOP_WINDOW = statement(
+    "popularity.top_window",
+    _TOP_WINDOW.format(branch_filter="")
+)
+
+TOP_WINDOW_BRANCH = statement(
+    "popularity.top_window_branch",
+    _TOP_WINDOW.format(branch_filter="AND d.BranchID = %s")
+)
+
+# All-time rankings need no aggregation: each reads the first N
+# entries of a (LoanCount DESC, ItemID) index and joins N items.
+TOP_ALL = statement(
+    "popularity.top_all",
+    """
+    SELECT
+        o.ItemID,
+        i.Title,
+        i.Author,
+        i.ItemType,
+        o.LoanCount
+    FROM ItemLoanOverall o
+    JOIN Item i ON o.ItemID = i.ItemID
+    ORDER BY o.LoanCount DESC, o.ItemID
+    LIMIT %s
+    """
+)
+
+TOP_ALL_BRANCH = statement(
+    "popularity.top_all_branch",
+    """
+    SELECT
+        t.ItemID,
+        i.Title,
+        i.Author,
+        i.ItemType,
+        t.LoanCount
+    FROM ItemLoanTotal t
+    JOIN Item i ON t.ItemID = i.ItemID
+    WHERE t.BranchID = %s
+    ORDER BY t.LoanCount DESC, t.ItemID
+    LIMIT %s
+    """
+)
+
+
+def record_loan(conn, item_id, branch_id, loan_date):
+    """
+    Counts one loan of an item at a branch.
+
+    Called inside the borrow transaction so the counters commit
+    (or roll back) together with the loan itself.
+    """
+    execute(conn, RECORD_DAILY_LOAN, (loan_date, branch_id, item_id))
+    execute(conn, RECORD_TOTAL_LOAN, (branch_id, item_id))
+    execute(conn, RECORD_OVERALL_LOAN, (item_id,))
+
+
+def top_items(conn, window, branch_id=None, limit=10):
+    """
+    Returns the most borrowed items for a window ("7d", "30d", "all"),
+    optionally restricted to one branch.
+
+    Results are cached for CACHE_SECONDS per (window, branch, limit).
+    """
+    today = date.today()
+    key = (window, branch_id, limit, today)
+    now = time.monotonic()
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and now - cached[0] < CACHE_SECONDS:
+        return cached[1]
+
+    days = WINDOWS[window]
+    if days is None:
+        if branch_id is None:
+            rows = fetch_all(conn, TOP_ALL, (limit,))
+        else:
+            rows = fetch_all(conn, TOP_ALL_BRANCH, (branch_id, limit))
+    else:
+        # Today's bucket counts as the first day of the window.
+        since = today - timedelta(days=days - 1)
+        if branch_id is None:
+            rows = fetch_all(conn, TOP_WINDOW, (since, limit))
+        else:
+            rows = fetch_all(conn, TOP_WINDOW_BRANCH, (since, branch_id, limit))
+
+    with _cache_lock:
+        # Drop entries from previous days so the cache stays bounded.
+        for stale in [k for k in _cache if k[3] != today]:
+            del _cache[stale]
+        _cache[key] = (now, rows)
+    return rows
+
+
+def rebuild_counters(conn, today=None):
+    """
+    Rebuilds the counter tables from the Loan history.
+
+    Daily buckets are kept for the windows ending on today
+    (defaults to the current date). Runs in a single transaction
+    so readers keep seeing the old rankings until the rebuild
+    commits.
+
+    Returns:
+        (daily bucket rows, per-branch total rows) written.
+    """
+    today = today or date.today()
+    since = today - timedelta(days=BUCKET_RETENTION_DAYS - 1)
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM ItemLoanDaily")
+    cursor.execute("""
+        INSERT INTO ItemLoanDaily (BucketDate, BranchID, ItemID, LoanCount)
+        SELECT l.LoanDate, ic.BranchID, ic.ItemID, COUNT(*)
+        FROM Loan l
+        JOIN ItemCopy ic ON l.CopyID = ic.CopyID
+        WHERE l.LoanDate >= %s
+        GROUP BY l.LoanDate, ic.BranchID, ic.ItemID
+    """, (since,))
+    daily_rows = cursor.rowcount
+
+    cursor.execute("DELETE FROM ItemLoanTotal")
+    cursor.execute("""
+        INSERT INTO ItemLoanTotal (BranchID, ItemID, LoanCount)
+        SELECT ic.BranchID, ic.ItemID, COUNT(*)
+        FROM Loan l
+        JOIN ItemCopy ic ON l.CopyID = ic.CopyID
+        GROUP BY ic.BranchID, ic.ItemID
+    """)
+    total_rows = cursor.rowcount
+
+    cursor.execute("DELETE FROM ItemLoanOverall")
+    cursor.execute("""
+        INSERT INTO ItemLoanOverall (ItemID, LoanCount)
+        SELECT ItemID, SUM(LoanCount)
+        FROM ItemLoanTotal
+        GROUP BY ItemID
+    """)
+
+    conn.commit()
+    cursor.close()
+
+    with _cache_lock:
+        _cache.clear()
+    return daily_rows, total_rows
+
+
+def prune_buckets(conn, today=None):
+    """
+    Deletes daily buckets that have fallen out of every window
+    ending on today (defaults to the current date).
+
+    Returns:
+        Number of bucket rows deleted.
+    """
+    today = today or date.today()
+    cutoff = today - timedelta(days=BUCKET_RETENTION_DAYS - 1)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM ItemLoanDaily WHERE BucketDate < %s", (cutoff,))
+    deleted = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return deleted
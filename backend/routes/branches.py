@@ -0,0 +1,227 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: branches.py
+Responsibility:
+    Provides branch-scoped stock queries, listing the
+    copies held at a branch with status and item type
+    filters and keyset pagination.
+Learning Outcomes:
+    LO2 – Design and implement RESTful web services
+    LO3 – Index-backed querying of a relational database
+-------------------------------------------------
+"""
+
+from flask import Blueprint, request, jsonify
+from db import get_db_connection
+from statements import statement, fetch_one, fetch_all
+import availability
+
+# Blueprint for branch-related routes.
+branches_bp = Blueprint("branches", __name__)
+
+# Copy statuses used by the loan routes.
+COPY_STATUSES = ("Available", "OnLoan")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# -------------------------------------------------
+# Registered statements
+# -------------------------------------------------
+# Listings are ordered by (ItemID, CopyID) and paginated with a
+# keyset cursor. InnoDB appends CopyID to secondary indexes, so with
+# a status filter the ItemCopy(BranchID, Status, ItemID) index and
+# without one the ItemCopy(BranchID, ItemID) index return rows
+# already in that order, starting at the cursor. A page therefore
+# reads only its own rows however deep it is, and no query sorts the
+# branch's stock. An item_type filter is checked while walking the
+# index, so a rare type reads past the copies of other types.
+GET_BRANCH = statement(
+    "branches.get",
+    "SELECT BranchID, BranchName FROM Branch WHERE BranchID = %s"
+)
+
+# Counts every available copy at the branch, so it is only run for
+# the first page of a listing.
+AVAILABLE_COUNT = statement(
+    "branches.available_count",
+    """
+    SELECT COUNT(*) AS available
+    FROM ItemCopy
+    WHERE BranchID = %s
+    AND Status = 'Available'
+    """
+)
+
+_INVENTORY = """
+    SELECT
+        ic.CopyID,
+        ic.ItemID,
+        i.Title,
+        i.ItemType,
+        ic.Status
+    FROM ItemCopy ic
+    JOIN Item i ON ic.ItemID = i.ItemID
+    WHERE ic.BranchID = %s
+    {status_filter}
+    {type_filter}
+    AND ic.ItemID >= %s
+    AND (ic.ItemID > %s OR (ic.ItemID = %s AND ic.CopyID > %s))
+    ORDER BY ic.ItemID, ic.CopyID
+    LIMIT %s
+"""
+
+# One prepared statement per filter combination, keyed by
+# (filter on status, filter on item type).
+INVENTORY_STATEMENTS = {
+    (by_status, by_type): statement(
+        f"branches.inventory.{int(by_status)}{int(by_type)}",
+        _INVENTORY.format(
+            status_filter="AND ic.Status = %s" if by_status else "",
+            type_filter="AND i.ItemType = %s" if by_type else ""
+        )
+    )
+    for by_status in (False, True)
+    for by_type in (False, True)
+}
+
+# Details for a page of copies chosen by the availability index.
+# The IN list is padded to MAX_PAGE_SIZE with 0 (never a CopyID) so
+# a single prepared statement serves every page.
+COPY_DETAILS = statement(
+    "branches.copy_details",
+    f"""
+    SELECT
+        ic.CopyID,
+        ic.ItemID,
+        i.Title,
+        i.ItemType,
+        ic.Status
+    FROM ItemCopy ic
+    JOIN Item i ON ic.ItemID = i.ItemID
+    WHERE ic.CopyID IN ({", ".join(["%s"] * MAX_PAGE_SIZE)})
+    ORDER BY ic.ItemID, ic.CopyID
+    """
+)
+
+
+def _parse_cursor(raw):
+    # Cursor format: "<ItemID>:<CopyID>" of the last copy returned.
+    # None means the first page.
+    if not raw:
+        return None
+    item_id, _, copy_id = raw.partition(":")
+    return (int(item_id), int(copy_id))
+
+
+# -------------------------------------------------
+# GET /branches/<branch_id>/inventory
+# -------------------------------------------------
+# Author: Abraham Sharkey
+# Responsibility:
+#   Lists the copies held at a branch, optionally filtered
+#   by status and item type, one page at a time.
+# Design Decision:
+#   available_count is only returned on the first page, so
+#   later pages never count the branch's whole stock.
+#   When BRANCH_AVAILABILITY_INDEX=1, listings of available
+#   copies and the available count are answered from the
+#   in-memory bitmap kept up to date by the loan routes.
+# Learning Outcomes:
+#   LO2 – RESTful GET endpoint with query parameters
+#   LO4 – Input validation using HTTP status codes
+# -------------------------------------------------
+@branches_bp.route("/branches/<int:branch_id>/inventory", methods=["GET"])
+def get_branch_inventory(branch_id):
+    status = request.args.get("status")
+    item_type = request.args.get("item_type")
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+
+    # Input validation
+    if status is not None and status not in COPY_STATUSES:
+        return jsonify({
+            "error": "status must be one of Available or OnLoan"
+        }), 400
+
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return jsonify({
+            "error": f"limit must be between 1 and {MAX_PAGE_SIZE}"
+        }), 400
+
+    try:
+        cursor = _parse_cursor(request.args.get("after"))
+    except ValueError:
+        return jsonify({"error": "after must be a cursor returned by this endpoint"}), 400
+
+    first_page = cursor is None
+    after = cursor or (0, 0)
+
+    conn = get_db_connection()
+
+    branch = fetch_one(conn, GET_BRANCH, (branch_id,))
+    if not branch:
+        conn.close()
+        return jsonify({"error": "Branch not found"}), 404
+
+    use_index = availability.AVAILABILITY_INDEX_ENABLED
+    index = availability.branch_availability
+
+    if use_index and status == "Available" and item_type is None:
+        keys = index.available_page(branch_id, after, limit)
+        copy_ids = [copy_id for _, copy_id in keys]
+        padding = [0] * (MAX_PAGE_SIZE - len(copy_ids))
+        copies = fetch_all(conn, COPY_DETAILS, copy_ids + padding) if keys else []
+        last_key = keys[-1] if len(keys) == limit else None
+    else:
+        params = [branch_id]
+        if status is not None:
+            params.append(status)
+        if item_type is not None:
+            params.append(item_type)
+        params += [after[0], after[0], after[0], after[1], limit]
+
+        stmt = INVENTORY_STATEMENTS[(status is not None, item_type is not None)]
+        copies = fetch_all(conn, stmt, params)
+        last_key = None
+        if len(copies) == limit:
+            last_key = (copies[-1]["ItemID"], copies[-1]["CopyID"])
+
+    response = {
+        "branch_id": branch["BranchID"],
+        "branch_name": branch["BranchName"],
+        "copies": copies,
+        "next_cursor": f"{last_key[0]}:{last_key[1]}" if last_key else None
+    }
+
+    if first_page:
+        if use_index:
+            response["available_count"] = index.available_count(branch_id)
+        else:
+            response["available_count"] = fetch_one(
+                conn, AVAILABLE_COUNT, (branch_id,)
+            )["available"]
+
+    conn.close()
+
+    return jsonify(response), 200
+
+
+# -------------------------------------------------
+# POST /branches/availability/reload
+# -------------------------------------------------
+# Author: Abraham Sharkey
+# Responsibility:
+#   Drops the in-memory availability bitmaps so they are
+#   reloaded from the database on next use.
+# Design Decision:
+#   The bitmaps only see borrows and returns made through
+#   this process. Call this after changing copies outside
+#   the backend (demo_reset.sql, tools.generate_dataset).
+# Learning Outcomes:
+#   LO2 – RESTful POST endpoint
+# -------------------------------------------------
+@branches_bp.route("/branches/availability/reload", methods=["POST"])
+def reload_branch_availability():
+    availability.branch_availability.invalidate()
+    return jsonify({"message": "Branch availability index cleared"}), 200
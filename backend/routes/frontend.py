@@ -0,0 +1,100 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: frontend.py
+Responsibility:
+    Serves the built frontend (see tools/build_frontend.py)
+    from the backend under /app/, with long-lived caching
+    for fingerprinted assets and precompressed responses.
+Learning Outcomes:
+    LO2 – Web-service configuration and HTTP caching
+-------------------------------------------------
+"""
+
+import mimetypes
+import os
+import re
+
+from flask import Blueprint, request, jsonify, send_file
+from werkzeug.security import safe_join
+
+# Blueprint serving the static user interface.
+frontend_bp = Blueprint("frontend", __name__)
+
+FRONTEND_DIST = os.getenv(
+    "FRONTEND_DIST",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "frontend",
+        "dist"
+    )
+)
+
+# Fingerprinted files never change content under the same name,
+# so browsers may cache them for a year without revalidating.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+# Pages keep stable names and must always be revalidated so that
+# a new build is picked up straight away.
+PAGE_CACHE = "no-cache"
+
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+
+# Precompressed variants, in order of preference.
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+# -------------------------------------------------
+# GET /app/<path>
+# -------------------------------------------------
+# Author: Abraham Sharkey
+# Responsibility:
+#   Returns a file from the frontend build, choosing a
+#   precompressed variant the browser accepts.
+# Design Decision:
+#   send_file lets the WSGI server stream the file with
+#   sendfile (or hand it to a front-end proxy when
+#   USE_X_SENDFILE is enabled) instead of reading it in Python.
+# -------------------------------------------------
+@frontend_bp.route("/app/", defaults={"path": "index.html"}, methods=["GET"])
+@frontend_bp.route("/app/<path:path>", methods=["GET"])
+def serve_frontend(path):
+    full_path = safe_join(FRONTEND_DIST, path)
+
+    # Error handling:
+    # Unknown files, and paths escaping the build folder, are 404s
+    if full_path is None or not os.path.isfile(full_path):
+        return jsonify({"error": "File not found"}), 404
+
+    mimetype = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+    served_path = full_path
+    encoding = None
+    # Pick the variant the client rates highest; q=0 is a refusal.
+    # On equal ratings the order of ENCODINGS decides.
+    variants = {name: full_path + suffix for name, suffix in ENCODINGS
+                if os.path.isfile(full_path + suffix)}
+    best = request.accept_encodings.best_match(list(variants))
+    if best and request.accept_encodings[best] > 0:
+        served_path = variants[best]
+        encoding = best
+
+    # download_name keeps Content-Disposition describing the requested
+    # file rather than the .gz/.br copy read from disk.
+    response = send_file(
+        served_path,
+        mimetype=mimetype,
+        download_name=os.path.basename(full_path),
+        conditional=True
+    )
+
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+
+    if FINGERPRINT_PATTERN.search(path):
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE
+    else:
+        response.headers["Cache-Control"] = PAGE_CACHE
+
+    return response
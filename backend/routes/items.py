@@ -11,13 +11,61 @@ Learning Outcomes:
 -------------------------------------------------
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from db import get_db_connection
+from statements import statement, fetch_one, fetch_all
+import popularity
 
 # Blueprint for item-related routes.
 # Using Blueprints improves modularity and keeps the API scalable.
 items_bp = Blueprint("items", __name__)
 
+# -------------------------------------------------
+# Registered statements
+# -------------------------------------------------
+# Declared once and executed as prepared statements.
+# Copy-level availability is handled separately to avoid redundancy,
+# so item queries select only essential item attributes.
+LIST_ITEMS = statement(
+    "items.list",
+    """
+    SELECT ItemID, Title, Author, ItemType
+    FROM Item
+    """
+)
+
+GET_ITEM = statement(
+    "items.get",
+    """
+    SELECT ItemID, Title, Author, ItemType
+    FROM Item
+    WHERE ItemID = %s
+    """
+)
+
+ITEM_EXISTS = statement(
+    "items.exists",
+    "SELECT ItemID FROM Item WHERE ItemID = %s"
+)
+
+ITEM_COPIES = statement(
+    "items.copies",
+    """
+    SELECT
+        ic.CopyID,
+        ic.Status,
+        b.BranchName
+    FROM ItemCopy ic
+    JOIN Branch b ON ic.BranchID = b.BranchID
+    WHERE ic.ItemID = %s
+    """
+)
+
+BRANCH_EXISTS = statement(
+    "items.branch_exists",
+    "SELECT BranchID FROM Branch WHERE BranchID = %s"
+)
+
 
 # -------------------------------------------------
 # GET /items
@@ -33,22 +81,89 @@ items_bp = Blueprint("items", __name__)
 @items_bp.route("/items", methods=["GET"])
 def get_items():
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Query only essential item attributes.
-    # Copy-level availability is handled separately to avoid redundancy.
-    cursor.execute("""
-        SELECT ItemID, Title, Author, ItemType
-        FROM Item
-    """)
-    items = cursor.fetchall()
-
+    items = fetch_all(conn, LIST_ITEMS)
     conn.close()
 
     # Returns a JSON array of items with HTTP 200 OK
     return jsonify(items), 200
 
 
+def parse_popular_args(args):
+    """
+    Validates the /items/popular query arguments. Whether the
+    branch exists is checked separately, against the database.
+
+    Shared with the async serving mode (asgi.py).
+
+    Returns:
+        ((window, branch_id, limit), None) when valid,
+        otherwise (None, error message).
+    """
+    window = args.get("window", "30d")
+    branch = args.get("branch")
+    limit = args.get("limit", 10, type=int)
+
+    # Only the precomputed windows can be served
+    if window not in popularity.WINDOWS:
+        return None, "window must be one of 7d, 30d or all"
+
+    # An unparseable branch is an error rather than "all branches"
+    branch_id = None
+    if branch is not None:
+        try:
+            branch_id = int(branch)
+        except ValueError:
+            return None, "branch must be an integer"
+
+    if limit < 1 or limit > 50:
+        return None, "limit must be between 1 and 50"
+
+    return (window, branch_id, limit), None
+
+
+# -------------------------------------------------
+# GET /items/popular
+# -------------------------------------------------
+# Author: Abraham Sharkey
+# Responsibility:
+#   Returns the most borrowed items over a rolling window
+#   (7d, 30d or all), optionally for a single branch.
+#   Used by the "Most Borrowed" section of the home page.
+# Design Decision:
+#   Rankings are read from precomputed loan counters that
+#   borrow_item keeps up to date, so the Loan table is never
+#   aggregated at request time.
+# Learning Outcomes:
+#   LO2 – RESTful GET endpoint with query parameters
+#   LO4 – Input validation using HTTP status codes
+# -------------------------------------------------
+@items_bp.route("/items/popular", methods=["GET"])
+def get_popular_items():
+    # Input validation
+    query, error = parse_popular_args(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    window, branch_id, limit = query
+
+    conn = get_db_connection()
+
+    # Unknown branches are rejected before the ranking cache is
+    # consulted, so arbitrary ids cannot fill it.
+    if branch_id is not None and not fetch_one(conn, BRANCH_EXISTS, (branch_id,)):
+        conn.close()
+        return jsonify({"error": "Branch not found"}), 404
+
+    items = popularity.top_items(conn, window, branch_id, limit)
+    conn.close()
+
+    return jsonify({
+        "window": window,
+        "branch_id": branch_id,
+        "items": items
+    }), 200
+
+
 # -------------------------------------------------
 # GET /items/<item_id>
 # -------------------------------------------------
@@ -63,16 +178,9 @@ def get_items():
 @items_bp.route("/items/<int:item_id>", methods=["GET"])
 def get_item(item_id):
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
     # Parameterised query prevents SQL injection
-    cursor.execute("""
-        SELECT ItemID, Title, Author, ItemType
-        FROM Item
-        WHERE ItemID = %s
-    """, (item_id,))
-
-    item = cursor.fetchone()
+    item = fetch_one(conn, GET_ITEM, (item_id,))
     conn.close()
 
     # Error handling:
@@ -100,20 +208,9 @@ def get_item(item_id):
 @items_bp.route("/items/<int:item_id>/copies", methods=["GET"])
 def get_item_copies(item_id):
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
     # Join ItemCopy with Branch to provide meaningful availability data
-    cursor.execute("""
-        SELECT
-            ic.CopyID,
-            ic.Status,
-            b.BranchName
-        FROM ItemCopy ic
-        JOIN Branch b ON ic.BranchID = b.BranchID
-        WHERE ic.ItemID = %s
-    """, (item_id,))
-
-    copies = cursor.fetchall()
+    copies = fetch_all(conn, ITEM_COPIES, (item_id,))
     conn.close()
 
     # Error handling:
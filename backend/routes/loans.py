@@ -14,12 +14,120 @@ Learning Outcomes:
 
 from flask import Blueprint, request, jsonify
 from db import get_db_connection
+from statements import statement, fetch_one, execute
+import popularity
+import availability
 from datetime import date, timedelta
 
 # Blueprint for loan-related routes.
 # Separating loan logic improves maintainability and clarity.
 loans_bp = Blueprint("loans", __name__)
 
+# Maximum number of simultaneous active loans per member.
+MAX_ACTIVE_LOANS = 3
+
+# -------------------------------------------------
+# Registered statements
+# -------------------------------------------------
+# Declared once and executed as prepared statements, so the
+# hot checks below are parsed by MySQL once per connection.
+#
+# Rows read with FOR UPDATE stay locked until the transaction
+# commits (or is rolled back when the connection is released),
+# so concurrent borrows cannot exceed the loan limit or take the
+# same copy twice.
+LOCK_MEMBER = statement(
+    "loans.lock_member",
+    """
+    SELECT MemberID, ActiveLoanCount
+    FROM Member
+    WHERE MemberID = %s
+    FOR UPDATE
+    """
+)
+
+GET_COPY = statement(
+    "loans.get_copy",
+    """
+    SELECT ItemID, BranchID, Status
+    FROM ItemCopy
+    WHERE CopyID = %s
+    FOR UPDATE
+    """
+)
+
+RESERVED_BY_OTHER = statement(
+    "loans.reserved_by_other",
+    """
+    SELECT ReservationID
+    FROM Reservation
+    WHERE ItemID = %s
+    AND MemberID != %s
+    """
+)
+
+INSERT_LOAN = statement(
+    "loans.insert",
+    """
+    INSERT INTO Loan (CopyID, MemberID, LoanDate, DueDate)
+    VALUES (%s, %s, %s, %s)
+    """
+)
+
+MARK_COPY_ON_LOAN = statement(
+    "loans.mark_copy_on_loan",
+    "UPDATE ItemCopy SET Status = 'OnLoan' WHERE CopyID = %s"
+)
+
+INCREMENT_ACTIVE_LOANS = statement(
+    "loans.increment_member_count",
+    """
+    UPDATE Member
+    SET ActiveLoanCount = ActiveLoanCount + 1
+    WHERE MemberID = %s
+    """
+)
+
+# Plain (non-locking) read of the borrower, so the return route can
+# lock the member row before the loan and copy rows. Both routes then
+# take their locks in the same order (Member, then ItemCopy/Loan), so
+# a borrow and a return by the same member cannot deadlock.
+LOAN_MEMBER = statement(
+    "loans.member",
+    "SELECT MemberID FROM Loan WHERE LoanID = %s"
+)
+
+GET_LOAN = statement(
+    "loans.get",
+    """
+    SELECT l.*, ic.BranchID
+    FROM Loan l
+    JOIN ItemCopy ic ON l.CopyID = ic.CopyID
+    WHERE l.LoanID = %s
+    FOR UPDATE
+    """
+)
+
+MARK_LOAN_RETURNED = statement(
+    "loans.mark_returned",
+    "UPDATE Loan SET ReturnDate = %s WHERE LoanID = %s"
+)
+
+MARK_COPY_AVAILABLE = statement(
+    "loans.mark_copy_available",
+    "UPDATE ItemCopy SET Status = 'Available' WHERE CopyID = %s"
+)
+
+DECREMENT_ACTIVE_LOANS = statement(
+    "loans.decrement_member_count",
+    """
+    UPDATE Member
+    SET ActiveLoanCount = ActiveLoanCount - 1
+    WHERE MemberID = %s
+    AND ActiveLoanCount > 0
+    """
+)
+
 
 # -------------------------------------------------
 # POST /loans
@@ -57,17 +165,15 @@ def borrow_item():
         }), 400
 
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
     # -------------------------
     # Business Rule 1:
     # Member must exist
     # -------------------------
-    cursor.execute(
-        "SELECT MemberID FROM Member WHERE MemberID = %s",
-        (member_id,)
-    )
-    if not cursor.fetchone():
+    # The member row is locked for the rest of the transaction so
+    # that parallel borrows by the same member are serialised.
+    member = fetch_one(conn, LOCK_MEMBER, (member_id,))
+    if not member:
         conn.close()
         return jsonify({"error": "Member not found"}), 404
 
@@ -75,18 +181,10 @@ def borrow_item():
     # Business Rule 2:
     # Maximum of 3 active loans per member
     # This rule is enforced at the backend to prevent bypassing
-    # via the frontend.
+    # via the frontend. The denormalised ActiveLoanCount avoids
+    # counting the member's loan history on every borrow.
     # -------------------------
-    cursor.execute(
-        """
-        SELECT COUNT(*) AS active_loans
-        FROM Loan
-        WHERE MemberID = %s
-        AND ReturnDate IS NULL
-        """,
-        (member_id,)
-    )
-    if cursor.fetchone()["active_loans"] >= 3:
+    if member["ActiveLoanCount"] >= MAX_ACTIVE_LOANS:
         conn.close()
         return jsonify({
             "error": "Borrowing limit reached (maximum 3 active loans)"
@@ -96,11 +194,7 @@ def borrow_item():
     # Business Rule 3:
     # Copy must exist and be available
     # -------------------------
-    cursor.execute(
-        "SELECT ItemID, Status FROM ItemCopy WHERE CopyID = %s",
-        (copy_id,)
-    )
-    copy = cursor.fetchone()
+    copy = fetch_one(conn, GET_COPY, (copy_id,))
 
     if not copy:
         conn.close()
@@ -118,16 +212,7 @@ def borrow_item():
     # Prevents borrowing if another member has an active reservation
     # for the same item, ensuring fairness.
     # -------------------------
-    cursor.execute(
-        """
-        SELECT ReservationID
-        FROM Reservation
-        WHERE ItemID = %s
-        AND MemberID != %s
-        """,
-        (item_id, member_id)
-    )
-    if cursor.fetchone():
+    if fetch_one(conn, RESERVED_BY_OTHER, (item_id, member_id)):
         conn.close()
         return jsonify({
             "error": "Item is reserved by another member"
@@ -141,21 +226,26 @@ def borrow_item():
     # -------------------------
     # Create loan record
     # -------------------------
-    cursor.execute(
-        """
-        INSERT INTO Loan (CopyID, MemberID, LoanDate, DueDate)
-        VALUES (%s, %s, %s, %s)
-        """,
-        (copy_id, member_id, loan_date, due_date)
-    )
+    execute(conn, INSERT_LOAN, (copy_id, member_id, loan_date, due_date))
 
     # Update copy status to reflect new loan
-    cursor.execute(
-        "UPDATE ItemCopy SET Status = 'OnLoan' WHERE CopyID = %s",
-        (copy_id,)
-    )
+    execute(conn, MARK_COPY_ON_LOAN, (copy_id,))
+
+    # Keep the member's active loan counter in step
+    execute(conn, INCREMENT_ACTIVE_LOANS, (member_id,))
 
-    conn.commit()
+    # Count the loan towards the item's popularity rankings
+    popularity.record_loan(conn, item_id, copy["BranchID"], loan_date)
+
+    # Update the in-memory branch index while the copy row is still
+    # locked, so updates for the same copy apply in commit order.
+    # If the commit fails the branch is dropped and reloaded.
+    availability.mark_on_loan(copy["BranchID"], copy_id)
+    try:
+        conn.commit()
+    except Exception:
+        availability.discard_branch(copy["BranchID"])
+        raise
     conn.close()
 
     return jsonify({
@@ -183,19 +273,21 @@ def borrow_item():
 @loans_bp.route("/loans/<int:loan_id>/return", methods=["PUT"])
 def return_item(loan_id):
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
     # Validate loan existence
-    cursor.execute(
-        "SELECT * FROM Loan WHERE LoanID = %s",
-        (loan_id,)
-    )
-    loan = cursor.fetchone()
+    borrower = fetch_one(conn, LOAN_MEMBER, (loan_id,))
 
-    if not loan:
+    if not borrower:
         conn.close()
         return jsonify({"error": "Loan not found"}), 404
 
+    # Lock the member first, matching the lock order of borrow_item
+    fetch_one(conn, LOCK_MEMBER, (borrower["MemberID"],))
+
+    # Then lock the loan and its copy
+    # (so the same loan cannot be returned twice concurrently)
+    loan = fetch_one(conn, GET_LOAN, (loan_id,))
+
     # Prevent returning the same loan twice
     if loan["ReturnDate"] is not None:
         conn.close()
@@ -204,18 +296,21 @@ def return_item(loan_id):
     return_date = date.today()
 
     # Mark loan as returned
-    cursor.execute(
-        "UPDATE Loan SET ReturnDate = %s WHERE LoanID = %s",
-        (return_date, loan_id)
-    )
+    execute(conn, MARK_LOAN_RETURNED, (return_date, loan_id))
 
     # Make the copy available again
-    cursor.execute(
-        "UPDATE ItemCopy SET Status = 'Available' WHERE CopyID = %s",
-        (loan["CopyID"],)
-    )
+    execute(conn, MARK_COPY_AVAILABLE, (loan["CopyID"],))
+
+    # Keep the member's active loan counter in step
+    execute(conn, DECREMENT_ACTIVE_LOANS, (loan["MemberID"],))
 
-    conn.commit()
+    # As in borrow_item, the index is updated under the copy's row lock
+    availability.mark_available(loan["BranchID"], loan["CopyID"])
+    try:
+        conn.commit()
+    except Exception:
+        availability.discard_branch(loan["BranchID"])
+        raise
     conn.close()
 
     return jsonify({
@@ -13,6 +13,7 @@ Learning Outcomes:
 
 from flask import Blueprint, jsonify
 from db import get_db_connection
+from statements import statement, fetch_one, fetch_all
 from datetime import date
 
 # Blueprint for member-related routes.
@@ -20,6 +21,81 @@ from datetime import date
 # provide a meaningful backend-driven summary.
 members_bp = Blueprint("members", __name__)
 
+# -------------------------------------------------
+# Registered statements
+# -------------------------------------------------
+# Declared once and executed as prepared statements.
+# MEMBER_EXISTS is shared with the loans and reservations routes.
+MEMBER_EXISTS = statement(
+    "members.exists",
+    "SELECT MemberID FROM Member WHERE MemberID = %s"
+)
+
+GET_MEMBER = statement(
+    "members.get",
+    """
+    SELECT
+        MemberID,
+        FirstName,
+        LastName,
+        Email,
+        Phone
+    FROM Member
+    WHERE MemberID = %s
+    """
+)
+
+MEMBER_ACTIVE_LOANS = statement(
+    "members.active_loans",
+    """
+    SELECT
+        l.LoanID,
+        l.CopyID,
+        i.Title,
+        l.DueDate
+    FROM Loan l
+    JOIN ItemCopy ic ON l.CopyID = ic.CopyID
+    JOIN Item i ON ic.ItemID = i.ItemID
+    WHERE l.MemberID = %s
+    AND l.ReturnDate IS NULL
+    """
+)
+
+MEMBER_RESERVATIONS = statement(
+    "members.reservations",
+    """
+    SELECT
+        r.ReservationID,
+        r.ReservationDate,
+        i.Title
+    FROM Reservation r
+    JOIN Item i ON r.ItemID = i.ItemID
+    WHERE r.MemberID = %s
+    ORDER BY r.ReservationDate ASC
+    """
+)
+
+
+# -------------------------------------------------
+# Dynamic overdue detection
+# -------------------------------------------------
+# Overdue status is intentionally calculated at runtime
+# to ensure accuracy and prevent stale or duplicated data.
+# Shared with the async serving mode (asgi.py).
+def annotate_overdue(active_loans):
+    today = date.today()
+
+    for loan in active_loans:
+        due_date = loan["DueDate"]
+        if due_date < today:
+            loan["is_overdue"] = True
+            loan["days_overdue"] = (today - due_date).days
+        else:
+            loan["is_overdue"] = False
+            loan["days_overdue"] = 0
+
+    return active_loans
+
 
 # -------------------------------------------------
 # GET /members/<member_id>
@@ -38,25 +114,11 @@ members_bp = Blueprint("members", __name__)
 @members_bp.route("/members/<int:member_id>", methods=["GET"])
 def get_member_summary(member_id):
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
     # -------------------------
     # Retrieve member details
     # -------------------------
-    cursor.execute(
-        """
-        SELECT 
-            MemberID,
-            FirstName,
-            LastName,
-            Email,
-            Phone
-        FROM Member
-        WHERE MemberID = %s
-        """,
-        (member_id,)
-    )
-    member = cursor.fetchone()
+    member = fetch_one(conn, GET_MEMBER, (member_id,))
 
     # Error handling:
     # Return a clear 404 response if the member does not exist
@@ -70,43 +132,11 @@ def get_member_summary(member_id):
     # Active loans are defined as loans that have not yet been returned.
     # Data is joined across Loan, ItemCopy, and Item to provide
     # meaningful item information (e.g. title).
-    cursor.execute(
-        """
-        SELECT
-            l.LoanID,
-            l.CopyID,
-            i.Title,
-            l.DueDate
-        FROM Loan l
-        JOIN ItemCopy ic ON l.CopyID = ic.CopyID
-        JOIN Item i ON ic.ItemID = i.ItemID
-        WHERE l.MemberID = %s
-        AND l.ReturnDate IS NULL
-        """,
-        (member_id,)
-    )
-
-    active_loans = cursor.fetchall()
+    active_loans = fetch_all(conn, MEMBER_ACTIVE_LOANS, (member_id,))
     conn.close()
 
-    # -------------------------
-    # Dynamic overdue detection
-    # -------------------------
-    # Overdue status is intentionally calculated at runtime
-    # to ensure accuracy and prevent stale or duplicated data.
-    today = date.today()
-
-    for loan in active_loans:
-        due_date = loan["DueDate"]
-        if due_date < today:
-            loan["is_overdue"] = True
-            loan["days_overdue"] = (today - due_date).days
-        else:
-            loan["is_overdue"] = False
-            loan["days_overdue"] = 0
-
     # Attach active loan data to the member summary
-    member["active_loans"] = active_loans
+    member["active_loans"] = annotate_overdue(active_loans)
 
     # Return structured JSON response
     return jsonify(member), 200
@@ -130,23 +160,7 @@ def get_member_summary(member_id):
 @members_bp.route("/members/<int:member_id>/reservations", methods=["GET"])
 def get_member_reservations(member_id):
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute(
-        """
-        SELECT
-            r.ReservationID,
-            r.ReservationDate,
-            i.Title
-        FROM Reservation r
-        JOIN Item i ON r.ItemID = i.ItemID
-        WHERE r.MemberID = %s
-        ORDER BY r.ReservationDate ASC
-        """,
-        (member_id,)
-    )
-
-    reservations = cursor.fetchall()
+    reservations = fetch_all(conn, MEMBER_RESERVATIONS, (member_id,))
     conn.close()
 
     return jsonify({"reservations": reservations}), 200
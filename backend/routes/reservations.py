@@ -13,6 +13,9 @@ Learning Outcomes:
 
 from flask import Blueprint, request, jsonify
 from db import get_db_connection
+from statements import statement, fetch_one, fetch_all, execute
+from routes.items import ITEM_EXISTS
+from routes.members import MEMBER_EXISTS
 from datetime import date
 
 # Blueprint responsible for reservation-related routes.
@@ -20,6 +23,66 @@ from datetime import date
 # when items are not immediately available.
 reservations_bp = Blueprint("reservations", __name__)
 
+# -------------------------------------------------
+# Registered statements
+# -------------------------------------------------
+# Declared once and executed as prepared statements.
+# Member and item existence checks are shared with other routes.
+RESERVATION_EXISTS = statement(
+    "reservations.exists",
+    """
+    SELECT ReservationID
+    FROM Reservation
+    WHERE ItemID = %s AND MemberID = %s
+    """
+)
+
+MEMBER_HAS_ITEM_ON_LOAN = statement(
+    "reservations.member_has_item_on_loan",
+    """
+    SELECT 1
+    FROM Loan l
+    JOIN ItemCopy ic ON l.CopyID = ic.CopyID
+    WHERE l.MemberID = %s
+      AND ic.ItemID = %s
+      AND l.ReturnDate IS NULL
+    LIMIT 1
+    """
+)
+
+INSERT_RESERVATION = statement(
+    "reservations.insert",
+    """
+    INSERT INTO Reservation (ItemID, MemberID, ReservationDate)
+    VALUES (%s, %s, %s)
+    """
+)
+
+INCREMENT_ACTIVE_RESERVATIONS = statement(
+    "reservations.increment_member_count",
+    """
+    UPDATE Member
+    SET ActiveReservationCount = ActiveReservationCount + 1
+    WHERE MemberID = %s
+    """
+)
+
+ITEM_RESERVATIONS = statement(
+    "reservations.for_item",
+    """
+    SELECT
+        r.ReservationID,
+        r.ReservationDate,
+        m.MemberID,
+        m.FirstName,
+        m.LastName
+    FROM Reservation r
+    JOIN Member m ON r.MemberID = m.MemberID
+    WHERE r.ItemID = %s
+    ORDER BY r.ReservationDate ASC
+    """
+)
+
 
 # -------------------------------------------------
 # POST /reservations
@@ -52,61 +115,32 @@ def create_reservation():
         return jsonify({"error": "item_id and member_id are required"}), 400
 
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
     # -------------------------
     # Validate member existence
     # -------------------------
-    cursor.execute(
-        "SELECT MemberID FROM Member WHERE MemberID = %s",
-        (member_id,)
-    )
-    if not cursor.fetchone():
+    if not fetch_one(conn, MEMBER_EXISTS, (member_id,)):
         conn.close()
         return jsonify({"error": "Member not found"}), 404
 
     # -------------------------
     # Validate item existence
     # -------------------------
-    cursor.execute(
-        "SELECT ItemID FROM Item WHERE ItemID = %s",
-        (item_id,)
-    )
-    if not cursor.fetchone():
+    if not fetch_one(conn, ITEM_EXISTS, (item_id,)):
         conn.close()
         return jsonify({"error": "Item not found"}), 404
 
     # -------------------------
     # Prevent duplicate reservations
     # -------------------------
-    cursor.execute(
-        """
-        SELECT ReservationID
-        FROM Reservation
-        WHERE ItemID = %s AND MemberID = %s
-        """,
-        (item_id, member_id)
-    )
-    if cursor.fetchone():
+    if fetch_one(conn, RESERVATION_EXISTS, (item_id, member_id)):
         conn.close()
         return jsonify({"error": "Item already reserved by this member"}), 409
 
     # -------------------------
     # Prevent reserving item already on loan by the same member
     # -------------------------
-    cursor.execute(
-        """
-        SELECT 1
-        FROM Loan l
-        JOIN ItemCopy ic ON l.CopyID = ic.CopyID
-        WHERE l.MemberID = %s
-          AND ic.ItemID = %s
-          AND l.ReturnDate IS NULL
-        LIMIT 1
-        """,
-        (member_id, item_id)
-    )
-    if cursor.fetchone():
+    if fetch_one(conn, MEMBER_HAS_ITEM_ON_LOAN, (member_id, item_id)):
         conn.close()
         return jsonify({
             "error": "You cannot reserve an item you currently have on loan"
@@ -117,13 +151,10 @@ def create_reservation():
     # -------------------------
     reservation_date = date.today()
 
-    cursor.execute(
-        """
-        INSERT INTO Reservation (ItemID, MemberID, ReservationDate)
-        VALUES (%s, %s, %s)
-        """,
-        (item_id, member_id, reservation_date)
-    )
+    execute(conn, INSERT_RESERVATION, (item_id, member_id, reservation_date))
+
+    # Keep the member's outstanding reservation counter in step
+    execute(conn, INCREMENT_ACTIVE_RESERVATIONS, (member_id,))
 
     conn.commit()
     conn.close()
@@ -152,25 +183,7 @@ def create_reservation():
 @reservations_bp.route("/items/<int:item_id>/reservations", methods=["GET"])
 def get_item_reservations(item_id):
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute(
-        """
-        SELECT
-            r.ReservationID,
-            r.ReservationDate,
-            m.MemberID,
-            m.FirstName,
-            m.LastName
-        FROM Reservation r
-        JOIN Member m ON r.MemberID = m.MemberID
-        WHERE r.ItemID = %s
-        ORDER BY r.ReservationDate ASC
-        """,
-        (item_id,)
-    )
-
-    reservations = cursor.fetchall()
+    reservations = fetch_all(conn, ITEM_RESERVATIONS, (item_id,))
     conn.close()
 
     return jsonify({
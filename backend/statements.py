@@ -0,0 +1,110 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: statements.py
+Responsibility:
+    Central registry of the SQL statements used by the
+    route modules, executed as server-side prepared
+    statements that are cached per database connection.
+Learning Outcomes:
+    LO3 – Efficient and secure database access
+-------------------------------------------------
+"""
+
+import os
+from collections import namedtuple
+
+# Switch between server-side prepared statements (binary protocol)
+# and plain text-protocol queries. The text protocol is the default:
+# mysql-connector sends a COM_STMT_RESET before every execution of a
+# cached prepared statement, so for single-row lookups the prepared
+# path can be slower. Measure with tools.bench_statements against the
+# target server and set DB_PREPARED_STATEMENTS=1 only if it wins.
+USE_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "0") == "1"
+
+# A registered statement: a unique name plus its SQL text.
+Statement = namedtuple("Statement", ["name", "sql"])
+
+_registry = {}
+
+
+def statement(name, sql):
+    """
+    Declares a named SQL statement.
+
+    Route modules call this once at import time; the returned
+    Statement is then passed to fetch_one / fetch_all / execute.
+
+    Raises:
+        ValueError: if the name has already been registered.
+    """
+    if name in _registry:
+        raise ValueError(f"Statement '{name}' is already registered")
+
+    # Collapse whitespace so the SQL text sent to the server is
+    # identical no matter how it was indented in the source.
+    stmt = Statement(name, " ".join(sql.split()))
+    _registry[name] = stmt
+    return stmt
+
+
+def registered_statements():
+    """Returns a copy of the statement registry keyed by name."""
+    return dict(_registry)
+
+
+def _prepared_cursor(conn, stmt):
+    # Pooled connections wrap the real connection; the cache is kept
+    # on the real connection so it survives being returned to the pool.
+    cnx = getattr(conn, "_cnx", conn)
+
+    # Prepared statements belong to a server session. If the
+    # connection has been re-established the old handles are invalid.
+    cache = getattr(cnx, "_statement_cache", None)
+    if cache is None or cache[0] != cnx.connection_id:
+        cache = (cnx.connection_id, {})
+        cnx._statement_cache = cache
+
+    cursors = cache[1]
+    cursor = cursors.get(stmt.name)
+    if cursor is None:
+        # Each prepared cursor holds one statement handle and only
+        # re-prepares when given a different SQL string.
+        cursor = cnx.cursor(prepared=True, dictionary=True)
+        cursors[stmt.name] = cursor
+    return cursor
+
+
+def _run(conn, stmt, params):
+    if USE_PREPARED_STATEMENTS:
+        cursor = _prepared_cursor(conn, stmt)
+    else:
+        cursor = conn.cursor(dictionary=True)
+    cursor.execute(stmt.sql, tuple(params))
+    return cursor
+
+
+def fetch_all(conn, stmt, params=()):
+    """Executes a registered statement and returns all rows as dicts."""
+    return _run(conn, stmt, params).fetchall()
+
+
+def fetch_one(conn, stmt, params=()):
+    """
+    Executes a registered statement and returns the first row, or None.
+
+    All rows are read so that no unread result is left on the
+    connection for the next statement.
+    """
+    rows = fetch_all(conn, stmt, params)
+    return rows[0] if rows else None
+
+
+def execute(conn, stmt, params=()):
+    """
+    Executes a registered data-modifying statement.
+
+    Returns:
+        The cursor, so callers can read rowcount / lastrowid.
+    """
+    return _run(conn, stmt, params)
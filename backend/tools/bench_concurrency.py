@@ -0,0 +1,104 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: bench_concurrency.py
+Responsibility:
+    Load-tests a running backend at increasing numbers of
+    concurrent clients, to compare the sync (Flask) and
+    async (asgi.py) serving modes on the same endpoint.
+Usage (from the backend folder, with both servers running):
+    python -m tools.bench_concurrency \\
+        --url http://127.0.0.1:5000 --url http://127.0.0.1:5001
+-------------------------------------------------
+"""
+
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def run_level(url, concurrency, requests_per_client):
+    """
+    Runs `concurrency` clients, each sending requests back to back.
+
+    Returns:
+        (requests per second, p50 ms, p95 ms, error count)
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def client():
+        local = []
+        failed = 0
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError):
+                # Includes 503s from admission control.
+                failed += 1
+                continue
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        _percentile(latencies, 0.50),
+        _percentile(latencies, 0.95),
+        errors[0],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare serving modes under concurrent load."
+    )
+    parser.add_argument(
+        "--url",
+        action="append",
+        required=True,
+        help="base URL of a running backend; repeat to compare modes"
+    )
+    parser.add_argument("--path", default="/members/1")
+    parser.add_argument("--concurrency", default="1,8,32,128")
+    parser.add_argument("--requests", type=int, default=50,
+                        help="requests per client at each level")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    print(f"{'server':<28}{'clients':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for base in args.url:
+        for level in levels:
+            rate, p50, p95, errors = run_level(
+                base.rstrip("/") + args.path, level, args.requests
+            )
+            print(f"{base:<28}{level:>8}{rate:>10.1f}"
+                  f"{p50:>10.1f}{p95:>10.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
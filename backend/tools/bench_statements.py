@@ -0,0 +1,87 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: bench_statements.py
+Responsibility:
+    Benchmarks the hot statements used by the loans and
+    reservations routes, comparing server-side prepared
+    statements against the plain text protocol.
+Usage (from the backend folder):
+    python -m tools.bench_statements [--iterations N]
+-------------------------------------------------
+"""
+
+import argparse
+import time
+
+import mysql.connector
+
+import statements
+from db import connection_config
+from routes.items import ITEM_EXISTS
+from routes.loans import GET_COPY, LOCK_MEMBER, RESERVED_BY_OTHER
+from routes.members import MEMBER_EXISTS
+from routes.reservations import MEMBER_HAS_ITEM_ON_LOAN, RESERVATION_EXISTS
+
+
+def _sample_ids(conn):
+    # Use real identifiers so every statement hits an index lookup
+    # rather than short-circuiting on an empty table.
+    cursor = conn.cursor()
+    cursor.execute("SELECT MIN(MemberID) FROM Member")
+    member_id = cursor.fetchone()[0] or 1
+    cursor.execute("SELECT MIN(CopyID), MIN(ItemID) FROM ItemCopy")
+    copy_id, item_id = cursor.fetchone()
+    cursor.close()
+    return member_id, copy_id or 1, item_id or 1
+
+
+def _time_statement(conn, stmt, params, iterations):
+    # One warm-up call so the prepare cost is not counted.
+    statements.fetch_all(conn, stmt, params)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        statements.fetch_all(conn, stmt, params)
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**connection_config())
+    member_id, copy_id, item_id = _sample_ids(conn)
+
+    # Results depend on both versions, so record them with the numbers.
+    print(f"mysql-connector {mysql.connector.__version__}, "
+          f"server {conn.get_server_info()}, {args.iterations} iterations")
+
+    cases = [
+        (MEMBER_EXISTS, (member_id,)),
+        (LOCK_MEMBER, (member_id,)),
+        (GET_COPY, (copy_id,)),
+        (RESERVED_BY_OTHER, (item_id, member_id)),
+        (ITEM_EXISTS, (item_id,)),
+        (RESERVATION_EXISTS, (item_id, member_id)),
+        (MEMBER_HAS_ITEM_ON_LOAN, (member_id, item_id)),
+    ]
+
+    print(f"{'statement':<40}{'text (us)':>12}{'prepared (us)':>16}{'speedup':>10}")
+    for stmt, params in cases:
+        statements.USE_PREPARED_STATEMENTS = False
+        text_us = _time_statement(conn, stmt, params, args.iterations)
+        statements.USE_PREPARED_STATEMENTS = True
+        prepared_us = _time_statement(conn, stmt, params, args.iterations)
+        print(
+            f"{stmt.name:<40}{text_us:>12.1f}{prepared_us:>16.1f}"
+            f"{text_us / prepared_us:>9.2f}x"
+        )
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: build_frontend.py
+Responsibility:
+    Builds the static frontend for serving by the backend:
+    fingerprints CSS, JavaScript and image filenames,
+    rewrites references to them, and writes gzip (and
+    brotli, when available) copies of text assets.
+Usage (from the backend folder):
+    python -m tools.build_frontend [--out DIR]
+-------------------------------------------------
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+
+# Brotli is optional; without it only gzip copies are produced.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "frontend")
+DEFAULT_OUT = os.path.join(FRONTEND_DIR, "dist")
+
+# Files whose names get a content hash. HTML pages keep their
+# names so that links and bookmarks stay stable.
+FINGERPRINT_EXTENSIONS = {
+    ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico"
+}
+
+# Files that may contain references to other files.
+REWRITE_EXTENSIONS = {".html", ".css", ".js"}
+
+# Files worth storing precompressed.
+COMPRESS_EXTENSIONS = {".html", ".css", ".js", ".svg", ".json"}
+
+# A quoted or url(...) reference ending in a fingerprintable extension.
+REFERENCE_PATTERN = re.compile(
+    r"""(?P<prefix>["'(])(?P<path>[^"'()\s]+?\.(?:css|js|png|jpe?g|gif|svg|webp|ico))(?=[)"'?#])"""
+)
+
+
+def _fingerprinted_name(rel_path, content):
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    root, ext = posixpath.splitext(rel_path)
+    return f"{root}.{digest}{ext}"
+
+
+def _rewrite_references(rel_path, text, manifest):
+    base = posixpath.dirname(rel_path)
+
+    def replace(match):
+        ref = match.group("path")
+        if ref.startswith(("/", "http:", "https:", "data:")) or "//" in ref:
+            return match.group(0)
+
+        # References in CSS resolve against the stylesheet, while paths
+        # in JavaScript strings resolve against the page that loaded it,
+        # and every page lives at the frontend root.
+        for candidate in (posixpath.normpath(posixpath.join(base, ref)),
+                          posixpath.normpath(ref)):
+            if candidate in manifest:
+                new_name = posixpath.basename(manifest[candidate])
+                new_ref = posixpath.join(posixpath.dirname(ref), new_name)
+                return match.group("prefix") + new_ref
+        return match.group(0)
+
+    return REFERENCE_PATTERN.sub(replace, text)
+
+
+def _write_compressed(path, content):
+    gz = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(gz) < len(content):
+        with open(path + ".gz", "wb") as f:
+            f.write(gz)
+
+    if brotli is not None:
+        br = brotli.compress(content, quality=11)
+        if len(br) < len(content):
+            with open(path + ".br", "wb") as f:
+                f.write(br)
+
+
+def build(out_dir=DEFAULT_OUT):
+    """
+    Builds the frontend into out_dir.
+
+    Returns:
+        The manifest mapping original paths to fingerprinted paths.
+    """
+    out_dir = os.path.abspath(out_dir)
+
+    sources = []
+    for root, dirs, files in os.walk(FRONTEND_DIR):
+        # Never treat a previous build as source.
+        dirs[:] = [d for d in dirs
+                   if os.path.abspath(os.path.join(root, d)) != out_dir]
+        for name in files:
+            full = os.path.join(root, name)
+            rel = os.path.relpath(full, FRONTEND_DIR).replace(os.sep, "/")
+            sources.append(rel)
+
+    # Binary assets first, then stylesheets and scripts (after their
+    # own references are rewritten), then pages, so every file is
+    # hashed over content that already points at hashed names.
+    def build_order(rel):
+        ext = posixpath.splitext(rel)[1].lower()
+        if ext == ".html":
+            return 2
+        if ext in REWRITE_EXTENSIONS:
+            return 1
+        return 0
+
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+
+    manifest = {}
+    for rel in sorted(sources, key=lambda r: (build_order(r), r)):
+        ext = posixpath.splitext(rel)[1].lower()
+        with open(os.path.join(FRONTEND_DIR, rel), "rb") as f:
+            content = f.read()
+
+        if ext in REWRITE_EXTENSIONS:
+            text = content.decode("utf-8")
+            content = _rewrite_references(rel, text, manifest).encode("utf-8")
+
+        out_rel = rel
+        if ext in FINGERPRINT_EXTENSIONS:
+            out_rel = _fingerprinted_name(rel, content)
+            manifest[rel] = out_rel
+
+        out_path = os.path.join(out_dir, *out_rel.split("/"))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, "wb") as f:
+            f.write(content)
+
+        if ext in COMPRESS_EXTENSIONS:
+            _write_compressed(out_path, content)
+
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the fingerprinted, precompressed frontend."
+    )
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    args = parser.parse_args()
+
+    manifest = build(args.out)
+    print(f"Built frontend into {args.out} ({len(manifest)} fingerprinted files)")
+    if brotli is None:
+        print("brotli is not installed; only gzip copies were written")
+
+
+if __name__ == "__main__":
+    main()
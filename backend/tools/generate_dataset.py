@@ -0,0 +1,555 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: generate_dataset.py
+Responsibility:
+    Generates a deterministic, production-sized dataset
+    for capacity testing: Zipf-skewed item popularity,
+    many copies per branch, years of loan history, active
+    loans and outstanding reservations.
+Usage (from the backend folder):
+    python -m tools.generate_dataset --size small --reset
+    python -m tools.generate_dataset --size large --out ../database/scale
+-------------------------------------------------
+"""
+
+import argparse
+import os
+import random
+import time
+from array import array
+from datetime import date, timedelta
+
+# Size presets. Loan counts are historical (returned) loans;
+# active loans are added on top at ACTIVE_LOAN_RATE of copies.
+PRESETS = {
+    "small": {
+        "branches": 3,
+        "items": 2_000,
+        "max_copies": 4,
+        "members": 5_000,
+        "loans": 50_000,
+        "reservations": 500,
+    },
+    "medium": {
+        "branches": 10,
+        "items": 50_000,
+        "max_copies": 6,
+        "members": 100_000,
+        "loans": 1_000_000,
+        "reservations": 10_000,
+    },
+    "large": {
+        "branches": 25,
+        "items": 250_000,
+        "max_copies": 8,
+        "members": 500_000,
+        "loans": 5_000_000,
+        "reservations": 50_000,
+    },
+}
+
+# Length of the generated loan history.
+HISTORY_DAYS = 3 * 365
+
+# Historical loans end this many days ago, leaving room for the
+# active loans without overlapping on the same copy.
+HISTORY_GAP_DAYS = 30
+
+# Most loans a single copy can carry over the history (one a week).
+# Demand for the most popular titles beyond this is redirected to
+# other titles, as it would be by reservations in a real library.
+COPY_LOAN_CAPACITY = HISTORY_DAYS // 7
+
+# Share of copies currently on loan.
+ACTIVE_LOAN_RATE = 0.15
+
+# Skew of item popularity and of member activity.
+ITEM_ZIPF_EXPONENT = 1.1
+MEMBER_ZIPF_EXPONENT = 0.8
+
+# Mirrors the borrowing limit enforced by routes/loans.py.
+MAX_ACTIVE_LOANS = 3
+
+LOAN_PERIOD_DAYS = 14
+
+ITEM_TYPES = ["Book", "DVD", "Audiobook", "Magazine"]
+ITEM_TYPE_WEIGHTS = [80, 10, 6, 4]
+
+TITLE_ADJECTIVES = [
+    "Silent", "Hidden", "Broken", "Golden", "Lost", "Practical", "Modern",
+    "Ancient", "Brief", "Complete", "Distant", "Endless", "Quiet", "Secret",
+]
+TITLE_NOUNS = [
+    "River", "Algorithms", "Garden", "Empire", "Patterns", "Kingdom",
+    "Systems", "Journey", "Histories", "Mountain", "Databases", "Ocean",
+    "Letters", "Machines",
+]
+FIRST_NAMES = [
+    "Aisha", "Ben", "Chloe", "Daniel", "Ella", "Farhan", "Grace", "Harry",
+    "Imran", "Jade", "Kofi", "Leah", "Mohammed", "Niamh", "Oliver", "Priya",
+]
+LAST_NAMES = [
+    "Ahmed", "Brown", "Clarke", "Davies", "Evans", "Hussain", "Jones",
+    "Khan", "Patel", "Roberts", "Smith", "Taylor", "Walker", "Wilson",
+]
+
+# Table columns in load order.
+TABLES = [
+    ("Branch", ["BranchID", "BranchName", "Address"]),
+    ("Item", ["ItemID", "Title", "Author", "ISBN", "ItemType"]),
+    ("Member", ["MemberID", "FirstName", "LastName", "Email", "Phone",
+                "ActiveLoanCount", "ActiveReservationCount"]),
+    ("ItemCopy", ["CopyID", "ItemID", "BranchID", "Status"]),
+    ("Loan", ["LoanID", "CopyID", "MemberID", "LoanDate", "DueDate",
+              "ReturnDate"]),
+    ("Reservation", ["ReservationID", "ItemID", "MemberID",
+                     "ReservationDate", "Status"]),
+]
+
+# Tables cleared by --reset, children first.
+RESET_TABLES = [
+    "ItemLoanDaily", "ItemLoanTotal", "ItemLoanOverall", "Reservation",
+    "Loan", "ItemCopy", "Member", "Item", "Branch",
+]
+
+
+def _zipf_cum_weights(n, exponent, rng):
+    """
+    Cumulative Zipf weights over n ids.
+
+    Ranks are shuffled so the most popular ids are spread across
+    the id range rather than always being the lowest ids.
+
+    Returns:
+        (cumulative weights indexed by id - 1, rank indexed by id - 1)
+    """
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+
+    cum_weights = []
+    total = 0.0
+    for rank in ranks:
+        total += 1.0 / rank ** exponent
+        cum_weights.append(total)
+    return cum_weights, ranks
+
+
+class _Plan:
+    """Everything that must be decided before rows can be written."""
+
+    def __init__(self, size, seed, today):
+        self.config = PRESETS[size]
+        self.seed = seed
+        self.today = today
+        self.rng = random.Random(seed)
+
+        n_items = self.config["items"]
+        n_members = self.config["members"]
+
+        self.item_weights, self.item_ranks = _zipf_cum_weights(
+            n_items, ITEM_ZIPF_EXPONENT, self.rng
+        )
+        self.member_weights, _ = _zipf_cum_weights(
+            n_members, MEMBER_ZIPF_EXPONENT, self.rng
+        )
+
+        self._plan_copies()
+        self._plan_active_loans()
+        self._plan_reservations()
+
+    def sample_items(self, k):
+        return self.rng.choices(
+            range(1, self.config["items"] + 1),
+            cum_weights=self.item_weights,
+            k=k
+        )
+
+    def sample_members(self, k):
+        return self.rng.choices(
+            range(1, self.config["members"] + 1),
+            cum_weights=self.member_weights,
+            k=k
+        )
+
+    def _plan_copies(self):
+        # The most popular items (top 1% by rank) are stocked at every
+        # branch, the next 10% have several copies spread across
+        # branches, and the long tail has one or two.
+        n_items = self.config["items"]
+        n_branches = self.config["branches"]
+        max_copies = self.config["max_copies"]
+        head_rank = max(1, n_items // 100)
+        popular_rank = max(1, n_items // 10)
+
+        self.item_first_copy = array("i", [0]) * (n_items + 1)
+        self.item_copy_count = array("i", [0]) * (n_items + 1)
+        self.copy_item = array("i", [0])
+        self.copy_branch = array("i", [0])
+
+        for item_id in range(1, n_items + 1):
+            rank = self.item_ranks[item_id - 1]
+            if rank <= head_rank:
+                branches = []
+                for branch_id in range(1, n_branches + 1):
+                    branches += [branch_id] * self.rng.randint(1, max_copies)
+            elif rank <= popular_rank:
+                branches = [self.rng.randint(1, n_branches)
+                            for _ in range(self.rng.randint(2, max_copies))]
+            else:
+                branches = [self.rng.randint(1, n_branches)
+                            for _ in range(self.rng.randint(1, 2))]
+
+            self.item_first_copy[item_id] = len(self.copy_item)
+            self.item_copy_count[item_id] = len(branches)
+            for branch_id in branches:
+                self.copy_item.append(item_id)
+                self.copy_branch.append(branch_id)
+
+        self.n_copies = len(self.copy_item) - 1
+
+    def _plan_active_loans(self):
+        # copy id -> (member id, loan date)
+        self.active_loans = {}
+        self.member_active_loans = array("b", [0]) * (self.config["members"] + 1)
+        self.member_items_on_loan = set()
+
+        for copy_id in range(1, self.n_copies + 1):
+            if self.rng.random() >= ACTIVE_LOAN_RATE:
+                continue
+
+            for member_id in self.sample_members(5):
+                if self.member_active_loans[member_id] < MAX_ACTIVE_LOANS:
+                    break
+            else:
+                continue
+
+            # Some active loans are already overdue.
+            loan_date = self.today - timedelta(days=self.rng.randint(0, 28))
+            self.active_loans[copy_id] = (member_id, loan_date)
+            self.member_active_loans[member_id] += 1
+            self.member_items_on_loan.add((member_id, self.copy_item[copy_id]))
+
+    def _plan_reservations(self):
+        # (item id, member id, reservation date)
+        self.reservations = []
+        self.member_reservations = array("i", [0]) * (self.config["members"] + 1)
+        seen = set()
+
+        target = self.config["reservations"]
+        attempts = 0
+        while len(self.reservations) < target and attempts < target * 10:
+            attempts += 1
+            item_id = self.sample_items(1)[0]
+            member_id = self.rng.randint(1, self.config["members"])
+
+            # Same rules as POST /reservations: no duplicates, and not
+            # for an item the member currently has on loan.
+            key = (item_id, member_id)
+            if key in seen or (member_id, item_id) in self.member_items_on_loan:
+                continue
+            seen.add(key)
+
+            reserved_on = self.today - timedelta(days=self.rng.randint(0, 14))
+            self.reservations.append((item_id, member_id, reserved_on))
+            self.member_reservations[member_id] += 1
+
+
+def _branch_rows(plan):
+    for branch_id in range(1, plan.config["branches"] + 1):
+        yield (branch_id, f"Branch {branch_id}", f"{branch_id} Library Street")
+
+
+def _item_rows(plan):
+    rng = random.Random(plan.seed + 1)
+    for item_id in range(1, plan.config["items"] + 1):
+        title = (f"The {rng.choice(TITLE_ADJECTIVES)} "
+                 f"{rng.choice(TITLE_NOUNS)} {item_id}")
+        author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        isbn = f"978{item_id:010d}"
+        item_type = rng.choices(ITEM_TYPES, weights=ITEM_TYPE_WEIGHTS)[0]
+        yield (item_id, title, author, isbn, item_type)
+
+
+def _member_rows(plan):
+    rng = random.Random(plan.seed + 2)
+    for member_id in range(1, plan.config["members"] + 1):
+        yield (
+            member_id,
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            f"member{member_id}@example.org",
+            f"07{rng.randrange(10 ** 9):09d}",
+            plan.member_active_loans[member_id],
+            plan.member_reservations[member_id],
+        )
+
+
+def _copy_rows(plan):
+    for copy_id in range(1, plan.n_copies + 1):
+        status = "OnLoan" if copy_id in plan.active_loans else "Available"
+        yield (copy_id, plan.copy_item[copy_id], plan.copy_branch[copy_id], status)
+
+
+def _loan_rows(plan):
+    # Historical loans are drawn by item popularity and assigned to
+    # a random copy of the item with spare capacity (otherwise the
+    # draw is repeated), then laid out per copy so that no copy is
+    # ever on two loans at once.
+    loans_per_copy = array("i", [0]) * (plan.n_copies + 1)
+    remaining = plan.config["loans"]
+    full_items = set()
+    while remaining and len(full_items) < plan.config["items"]:
+        for item_id in plan.sample_items(min(remaining, 100_000)):
+            if item_id in full_items:
+                continue
+            first = plan.item_first_copy[item_id]
+            count = plan.item_copy_count[item_id]
+            start = plan.rng.randrange(count)
+            for n in range(count):
+                copy_id = first + (start + n) % count
+                if loans_per_copy[copy_id] < COPY_LOAN_CAPACITY:
+                    loans_per_copy[copy_id] += 1
+                    remaining -= 1
+                    break
+            else:
+                full_items.add(item_id)
+
+    history_end = plan.today - timedelta(days=HISTORY_GAP_DAYS)
+    history_start = history_end - timedelta(days=HISTORY_DAYS)
+    span = HISTORY_DAYS
+
+    loan_id = 0
+    for copy_id in range(1, plan.n_copies + 1):
+        count = loans_per_copy[copy_id]
+        if count == 0:
+            continue
+
+        slot = span // count
+        members = plan.sample_members(count)
+        for n in range(count):
+            duration = min(plan.rng.randint(3, 21), slot - 1)
+            offset = n * slot + plan.rng.randrange(slot - duration)
+            loan_date = history_start + timedelta(days=offset)
+            loan_id += 1
+            yield (
+                loan_id,
+                copy_id,
+                members[n],
+                loan_date,
+                loan_date + timedelta(days=LOAN_PERIOD_DAYS),
+                loan_date + timedelta(days=duration),
+            )
+
+    for copy_id, (member_id, loan_date) in sorted(plan.active_loans.items()):
+        loan_id += 1
+        yield (
+            loan_id,
+            copy_id,
+            member_id,
+            loan_date,
+            loan_date + timedelta(days=LOAN_PERIOD_DAYS),
+            None,
+        )
+
+
+def _reservation_rows(plan):
+    for reservation_id, (item_id, member_id, reserved_on) in enumerate(
+            plan.reservations, start=1):
+        yield (reservation_id, item_id, member_id, reserved_on, "Active")
+
+
+ROW_SOURCES = {
+    "Branch": _branch_rows,
+    "Item": _item_rows,
+    "Member": _member_rows,
+    "ItemCopy": _copy_rows,
+    "Loan": _loan_rows,
+    "Reservation": _reservation_rows,
+}
+
+
+# -------------------------------------------------
+# Output: direct multi-row INSERTs
+# -------------------------------------------------
+def _reset(conn):
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in RESET_TABLES:
+        cursor.execute(f"TRUNCATE TABLE {table}")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.close()
+
+
+def _insert_rows(conn, table, columns, rows, batch_size):
+    # executemany rewrites a batch into one multi-row INSERT,
+    # so each batch is a single round trip.
+    placeholders = ", ".join(["%s"] * len(columns))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    cursor = conn.cursor()
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(sql, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+        total += len(batch)
+
+    conn.commit()
+    cursor.close()
+    return total
+
+
+def _non_empty_tables(conn):
+    cursor = conn.cursor()
+    tables = []
+    for table, _ in TABLES:
+        cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+        if cursor.fetchall():
+            tables.append(table)
+    cursor.close()
+    return tables
+
+
+def load_into_database(plan, batch_size, reset):
+    # Imported here so that --out works without database access.
+    import mysql.connector
+
+    import popularity
+    from db import connection_config
+
+    conn = mysql.connector.connect(**connection_config())
+    if reset:
+        _reset(conn)
+    else:
+        # Generated rows carry explicit ids starting at 1, so loading
+        # on top of existing data would fail part way through with a
+        # duplicate key, leaving earlier tables half loaded.
+        existing = _non_empty_tables(conn)
+        if existing:
+            conn.close()
+            raise SystemExit(
+                f"{', '.join(existing)} already contain rows; "
+                "rerun with --reset to replace them"
+            )
+
+    # Rows are generated consistently, so per-row checks can be
+    # skipped for the duration of the bulk load.
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute("SET UNIQUE_CHECKS = 0")
+    cursor.close()
+
+    for table, columns in TABLES:
+        start = time.perf_counter()
+        total = _insert_rows(conn, table, columns,
+                             ROW_SOURCES[table](plan), batch_size)
+        print(f"{table:<12}{total:>12,} rows in "
+              f"{time.perf_counter() - start:.1f}s")
+
+    cursor = conn.cursor()
+    cursor.execute("SET UNIQUE_CHECKS = 1")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.close()
+
+    # Derived popularity counters come from the generated history,
+    # bucketed against the dataset's own reference date.
+    popularity.rebuild_counters(conn, plan.today)
+    conn.close()
+
+
+# -------------------------------------------------
+# Output: bulk-load files
+# -------------------------------------------------
+def _tsv_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def write_load_files(plan, out_dir):
+    # Reads DB_NAME (and .env) only; no connection is opened.
+    from db import connection_config
+
+    database = connection_config()["database"] or "library_db"
+    os.makedirs(out_dir, exist_ok=True)
+
+    # LOAD DATA LOCAL treats duplicate keys like IGNORE, so loading
+    # over existing rows would silently keep them and drop the
+    # generated rows with the same ids. Empty every table first,
+    # as --reset does for a direct load.
+    statements = ["SET FOREIGN_KEY_CHECKS = 0;", "SET UNIQUE_CHECKS = 0;"]
+    statements += [f"TRUNCATE TABLE {table};" for table in RESET_TABLES]
+    for table, columns in TABLES:
+        filename = f"{table}.tsv"
+        total = 0
+        with open(os.path.join(out_dir, filename), "w", encoding="utf-8",
+                  newline="\n") as f:
+            for row in ROW_SOURCES[table](plan):
+                f.write("\t".join(_tsv_value(v) for v in row) + "\n")
+                total += 1
+        print(f"{table:<12}{total:>12,} rows -> {filename}")
+
+        statements.append(
+            f"LOAD DATA LOCAL INFILE '{filename}' INTO TABLE {table}\n"
+            f"    FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'\n"
+            f"    ({', '.join(columns)});"
+        )
+    statements += ["SET UNIQUE_CHECKS = 1;", "SET FOREIGN_KEY_CHECKS = 1;"]
+
+    with open(os.path.join(out_dir, "load.sql"), "w", encoding="utf-8") as f:
+        f.write(f"USE `{database}`;\n\n" + "\n\n".join(statements) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic scale dataset for library_db."
+    )
+    parser.add_argument("--size", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=5387)
+    parser.add_argument(
+        "--today",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="reference date (YYYY-MM-DD); fix it for byte-identical output"
+    )
+    parser.add_argument(
+        "--out",
+        help="write TSV files and load.sql here instead of loading directly"
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="truncate all library tables before loading"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    plan = _Plan(args.size, args.seed, args.today)
+    print(f"Planned {args.size} dataset (seed {args.seed}): "
+          f"{plan.n_copies:,} copies, {len(plan.active_loans):,} active loans, "
+          f"{len(plan.reservations):,} reservations "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    if args.out:
+        write_load_files(plan, args.out)
+        print(f"Load with: cd {args.out} && "
+              "mysql --local-infile=1 -u <user> -p < load.sql")
+        print("Then run: python -m tools.popularity_backfill "
+              f"--today {args.today.isoformat()}")
+    else:
+        load_into_database(plan, args.batch_size, args.reset)
+        print("A backend running with BRANCH_AVAILABILITY_INDEX=1 must be "
+              "reloaded: POST /branches/availability/reload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: member_counters.py
+Responsibility:
+    Checks and repairs the denormalised ActiveLoanCount
+    and ActiveReservationCount columns on Member by
+    recomputing them from the Loan and Reservation tables.
+Usage (from the backend folder):
+    python -m tools.member_counters            # report drift
+    python -m tools.member_counters --repair   # fix drift
+-------------------------------------------------
+"""
+
+import argparse
+import sys
+
+from db import get_db_connection
+
+# Derived counts per member, computed in bulk with one GROUP BY
+# per table rather than one query per member.
+_EXPECTED_COUNTS = """
+    SELECT
+        m.MemberID,
+        m.ActiveLoanCount,
+        m.ActiveReservationCount,
+        COALESCE(l.ActiveLoans, 0) AS ExpectedLoans,
+        COALESCE(r.ActiveReservations, 0) AS ExpectedReservations
+    FROM Member m
+    LEFT JOIN (
+        SELECT MemberID, COUNT(*) AS ActiveLoans
+        FROM Loan
+        WHERE ReturnDate IS NULL
+        GROUP BY MemberID
+    ) l ON l.MemberID = m.MemberID
+    LEFT JOIN (
+        SELECT MemberID, COUNT(*) AS ActiveReservations
+        FROM Reservation
+        WHERE Status = 'Active'
+        GROUP BY MemberID
+    ) r ON r.MemberID = m.MemberID
+"""
+
+
+def find_drift(conn):
+    """
+    Returns the members whose stored counters differ from the
+    values derived from Loan and Reservation.
+    """
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"""
+        SELECT * FROM ({_EXPECTED_COUNTS}) c
+        WHERE c.ActiveLoanCount <> c.ExpectedLoans
+        OR c.ActiveReservationCount <> c.ExpectedReservations
+    """)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def repair_counters(conn):
+    """
+    Recomputes every member's counters in a single bulk UPDATE.
+
+    Returns:
+        Number of member rows that were changed.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE Member m
+        LEFT JOIN (
+            SELECT MemberID, COUNT(*) AS ActiveLoans
+            FROM Loan
+            WHERE ReturnDate IS NULL
+            GROUP BY MemberID
+        ) l ON l.MemberID = m.MemberID
+        LEFT JOIN (
+            SELECT MemberID, COUNT(*) AS ActiveReservations
+            FROM Reservation
+            WHERE Status = 'Active'
+            GROUP BY MemberID
+        ) r ON r.MemberID = m.MemberID
+        SET m.ActiveLoanCount = COALESCE(l.ActiveLoans, 0),
+            m.ActiveReservationCount = COALESCE(r.ActiveReservations, 0)
+    """)
+    changed = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check or repair the Member loan/reservation counters."
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="recompute all counters instead of only reporting drift"
+    )
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+
+    if args.repair:
+        changed = repair_counters(conn)
+        conn.close()
+        print(f"Repaired counters for {changed} member(s)")
+        return 0
+
+    drift = find_drift(conn)
+    conn.close()
+
+    for row in drift:
+        print(
+            f"Member {row['MemberID']}: "
+            f"loans {row['ActiveLoanCount']} (expected {row['ExpectedLoans']}), "
+            f"reservations {row['ActiveReservationCount']} "
+            f"(expected {row['ExpectedReservations']})"
+        )
+
+    if drift:
+        print(f"{len(drift)} member(s) have inconsistent counters; "
+              "run with --repair to fix")
+        return 1
+
+    print("All member counters are consistent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+-------------------------------------------------
+Author: Abraham Sharkey
+File: popularity_backfill.py
+Responsibility:
+    Rebuilds the popularity counter tables from the
+    Loan history, or prunes expired daily buckets.
+Usage (from the backend folder):
+    python -m tools.popularity_backfill           # full rebuild
+    python -m tools.popularity_backfill --prune   # prune only
+-------------------------------------------------
+"""
+
+import argparse
+from datetime import date
+
+import popularity
+from db import get_db_connection
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild or prune the item popularity counters."
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="only delete daily buckets older than the longest window"
+    )
+    parser.add_argument(
+        "--today",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="reference date for the daily buckets (YYYY-MM-DD), e.g. the "
+             "--today a generated dataset was built with"
+    )
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+
+    if args.prune:
+        deleted = popularity.prune_buckets(conn, args.today)
+        print(f"Deleted {deleted} expired daily bucket(s)")
+    else:
+        daily_rows, total_rows = popularity.rebuild_counters(conn, args.today)
+        print(
+            f"Rebuilt {daily_rows} daily bucket(s) and "
+            f"{total_rows} all-time counter(s)"
+        )
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -25,9 +25,21 @@ USE library_db;
 -- Remove all active and historical loans
 DELETE FROM Loan;
 
+-- Remove the popularity counters derived from those loans
+DELETE FROM ItemLoanDaily;
+DELETE FROM ItemLoanTotal;
+DELETE FROM ItemLoanOverall;
+
 -- Remove all reservations
 DELETE FROM Reservation;
 
 -- Restore all item copies to an available state
+-- (a backend running with BRANCH_AVAILABILITY_INDEX=1 does not see
+-- this; call POST /branches/availability/reload afterwards)
 UPDATE ItemCopy
 SET Status = 'Available';
+
+-- Clear the denormalised member counters to match
+UPDATE Member
+SET ActiveLoanCount = 0,
+    ActiveReservationCount = 0;
@@ -0,0 +1,42 @@
+/*
+-------------------------------------------------
+Author: Abraham Sharkey
+File: 001_member_counters.sql
+Responsibility:
+    Upgrades an existing library_db to hold the
+    denormalised active loan and reservation counters
+    on Member, and initialises them from current data.
+
+Purpose:
+    Lets the borrowing limit be checked with a single
+    locked row read instead of counting loan history.
+
+Learning Outcomes:
+    LO3 – Schema evolution and data integrity
+-------------------------------------------------
+*/
+
+USE library_db;
+
+ALTER TABLE Member
+    ADD COLUMN ActiveLoanCount INT NOT NULL DEFAULT 0,
+    ADD COLUMN ActiveReservationCount INT NOT NULL DEFAULT 0;
+
+-- -------------------------------------------------
+-- Initialise counters from existing loans and reservations
+-- -------------------------------------------------
+UPDATE Member m
+LEFT JOIN (
+    SELECT MemberID, COUNT(*) AS ActiveLoans
+    FROM Loan
+    WHERE ReturnDate IS NULL
+    GROUP BY MemberID
+) l ON l.MemberID = m.MemberID
+LEFT JOIN (
+    SELECT MemberID, COUNT(*) AS ActiveReservations
+    FROM Reservation
+    WHERE Status = 'Active'
+    GROUP BY MemberID
+) r ON r.MemberID = m.MemberID
+SET m.ActiveLoanCount = COALESCE(l.ActiveLoans, 0),
+    m.ActiveReservationCount = COALESCE(r.ActiveReservations, 0);
@@ -0,0 +1,38 @@
+/*
+-------------------------------------------------
+Author: Abraham Sharkey
+File: 002_item_loan_counters.sql
+Responsibility:
+    Adds the precomputed loan counter tables used by
+    the GET /items/popular rankings.
+
+Purpose:
+    After running this script, populate the counters
+    from existing loan history with
+    `python -m tools.popularity_backfill` (from backend/).
+
+Learning Outcomes:
+    LO3 – Schema evolution and derived data
+-------------------------------------------------
+*/
+
+USE library_db;
+
+CREATE TABLE ItemLoanDaily (
+    BucketDate DATE NOT NULL,
+    BranchID INT NOT NULL,
+    ItemID INT NOT NULL,
+    LoanCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (BucketDate, BranchID, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES Item(ItemID),
+    FOREIGN KEY (BranchID) REFERENCES Branch(BranchID)
+);
+
+CREATE TABLE ItemLoanTotal (
+    BranchID INT NOT NULL,
+    ItemID INT NOT NULL,
+    LoanCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (BranchID, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES Item(ItemID),
+    FOREIGN KEY (BranchID) REFERENCES Branch(BranchID)
+);
@@ -0,0 +1,17 @@
+/*
+-------------------------------------------------
+Author: Abraham Sharkey
+File: 003_itemcopy_branch_index.sql
+Responsibility:
+    Adds the composite index behind the branch
+    inventory endpoint (GET /branches/<id>/inventory).
+
+Learning Outcomes:
+    LO3 – Indexing for query performance
+-------------------------------------------------
+*/
+
+USE library_db;
+
+CREATE INDEX idx_itemcopy_branch_status_item
+    ON ItemCopy (BranchID, Status, ItemID);
@@ -0,0 +1,29 @@
+/*
+-------------------------------------------------
+Author: Abraham Sharkey
+File: 004_popularity_rank_indexes.sql
+Responsibility:
+    Adds the all-branches loan totals table and the
+    ranking indexes that let GET /items/popular?window=all
+    read the top N rows straight from an index.
+
+Purpose:
+    After running this script, populate the new table
+    with `python -m tools.popularity_backfill` (from backend/).
+
+Learning Outcomes:
+    LO3 – Indexing for query performance
+-------------------------------------------------
+*/
+
+USE library_db;
+
+CREATE INDEX idx_itemloantotal_branch_rank
+    ON ItemLoanTotal (BranchID, LoanCount DESC, ItemID);
+
+CREATE TABLE ItemLoanOverall (
+    ItemID INT NOT NULL PRIMARY KEY,
+    LoanCount INT NOT NULL DEFAULT 0,
+    INDEX idx_itemloanoverall_rank (LoanCount DESC, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES Item(ItemID)
+);
@@ -0,0 +1,17 @@
+/*
+-------------------------------------------------
+Author: Abraham Sharkey
+File: 005_itemcopy_branch_item_index.sql
+Responsibility:
+    Adds the index that serves branch inventory listings
+    without a status filter in (ItemID, CopyID) order.
+
+Learning Outcomes:
+    LO3 – Indexing for query performance
+-------------------------------------------------
+*/
+
+USE library_db;
+
+CREATE INDEX idx_itemcopy_branch_item
+    ON ItemCopy (BranchID, ItemID);
@@ -56,16 +56,31 @@ CREATE TABLE ItemCopy (
     FOREIGN KEY (BranchID) REFERENCES Branch(BranchID)
 );
 
+-- Serve branch stock queries (GET /branches/<id>/inventory)
+-- in item then copy order: by branch and status when a status
+-- filter is given, otherwise by branch alone.
+CREATE INDEX idx_itemcopy_branch_status_item
+    ON ItemCopy (BranchID, Status, ItemID);
+
+CREATE INDEX idx_itemcopy_branch_item
+    ON ItemCopy (BranchID, ItemID);
+
 -- -------------------------------------------------
 -- Member
 -- -------------------------------------------------
 -- Represents registered library members.
+-- ActiveLoanCount and ActiveReservationCount are denormalised
+-- counters maintained by the loan and reservation routes so the
+-- borrowing limit is a single row read. They can be recomputed
+-- with `python -m tools.member_counters --repair`.
 CREATE TABLE Member (
     MemberID INT AUTO_INCREMENT PRIMARY KEY,
     FirstName VARCHAR(100) NOT NULL,
     LastName VARCHAR(100) NOT NULL,
     Email VARCHAR(150) UNIQUE NOT NULL,
-    Phone VARCHAR(20)
+    Phone VARCHAR(20),
+    ActiveLoanCount INT NOT NULL DEFAULT 0,
+    ActiveReservationCount INT NOT NULL DEFAULT 0
 );
 
 -- -------------------------------------------------
@@ -98,3 +113,44 @@ CREATE TABLE Reservation (
     FOREIGN KEY (ItemID) REFERENCES Item(ItemID),
     FOREIGN KEY (MemberID) REFERENCES Member(MemberID)
 );
+
+-- -------------------------------------------------
+-- Item Loan Counters (popularity rankings)
+-- -------------------------------------------------
+-- Precomputed loan counts used by GET /items/popular.
+-- ItemLoanDaily holds one bucket per day, branch and item
+-- for the rolling windows; ItemLoanTotal holds all-time
+-- counts per branch and ItemLoanOverall all-time counts
+-- across every branch. All three are incremented by the
+-- borrow route and can be rebuilt from Loan with
+-- `python -m tools.popularity_backfill`.
+--
+-- The descending LoanCount indexes let an all-time top-N
+-- query read just N index entries instead of sorting the
+-- whole table.
+CREATE TABLE ItemLoanDaily (
+    BucketDate DATE NOT NULL,
+    BranchID INT NOT NULL,
+    ItemID INT NOT NULL,
+    LoanCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (BucketDate, BranchID, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES Item(ItemID),
+    FOREIGN KEY (BranchID) REFERENCES Branch(BranchID)
+);
+
+CREATE TABLE ItemLoanTotal (
+    BranchID INT NOT NULL,
+    ItemID INT NOT NULL,
+    LoanCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (BranchID, ItemID),
+    INDEX idx_itemloantotal_branch_rank (BranchID, LoanCount DESC, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES Item(ItemID),
+    FOREIGN KEY (BranchID) REFERENCES Branch(BranchID)
+);
+
+CREATE TABLE ItemLoanOverall (
+    ItemID INT NOT NULL PRIMARY KEY,
+    LoanCount INT NOT NULL DEFAULT 0,
+    INDEX idx_itemloanoverall_rank (LoanCount DESC, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES Item(ItemID)
+);
@@ -1,6 +1,7 @@
 // waiting for page to load first
 document.addEventListener("DOMContentLoaded", () => {
   const bookList = document.querySelector(".book-list");
+  const popularList = document.getElementById("popularList");
   const searchInput = document.getElementById("searchInput");
   const clearBtn = document.getElementById("clearBtn");
 
@@ -20,8 +21,8 @@ document.addEventListener("DOMContentLoaded", () => {
     return "assets/book-placeholder.png";
   }
 
-  function renderItems(items) {
-    bookList.innerHTML = "";
+  function renderItems(items, list = bookList) {
+    list.innerHTML = "";
 
     items.forEach((item) => {
       const image = pickImageByTitle(item.Title);
@@ -38,7 +39,7 @@ document.addEventListener("DOMContentLoaded", () => {
         <span><strong>Type:</strong> ${item.ItemType ?? ""}</span>
       `;
 
-      bookList.appendChild(card);
+      list.appendChild(card);
     });
   }
 
@@ -56,6 +57,27 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  // most borrowed items come from the precomputed rankings
+  async function loadPopularItems() {
+    if (!popularList) return;
+    popularList.innerHTML = `<p>Loading popular items...</p>`;
+
+    try {
+      const res = await fetch(`${API_BASE}/items/popular?window=30d&limit=4`);
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      const data = await res.json();
+
+      if (data.items.length === 0) {
+        popularList.innerHTML = `<p>No items borrowed this month yet.</p>`;
+        return;
+      }
+      renderItems(data.items, popularList);
+    } catch (err) {
+      console.error(err);
+      popularList.innerHTML = `<p>Could not load popular items.</p>`;
+    }
+  }
+
   // search box behaviour 
   searchInput.addEventListener("input", () => {
     clearBtn.style.display = searchInput.value.length > 0 ? "inline" : "none";
@@ -93,6 +115,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
   // loading everything when page opens
   loadItems();
+  loadPopularItems();
 
 });
 